@@ -1,6 +1,6 @@
-import os
 from celery import Celery
 from dotenv import load_dotenv
+from db.redis import get_redis_url
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -8,17 +8,8 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-# Redis 연결 정보
-redis_host = os.getenv("REDIS_HOST", "localhost")
-redis_port = int(os.getenv("REDIS_PORT", 6379))
-redis_db = int(os.getenv("REDIS_DB", 0))
-redis_password = os.getenv("REDIS_PASSWORD")
-
-# Redis URL 구성
-if redis_password:
-    redis_url = f"redis://:{redis_password}@{redis_host}:{redis_port}/{redis_db}"
-else:
-    redis_url = f"redis://{redis_host}:{redis_port}/{redis_db}"
+# Redis URL 구성 (queue/rate limiter와 같은 환경 변수 사용)
+redis_url = get_redis_url()
 
 # Celery 앱 초기화
 celery_app = Celery(
@@ -37,7 +28,7 @@ celery_app.conf.update(
     enable_utc=True,
 )
 
-# 작업 스케줄 설정
+# 작업 스케줄 설정 (SCHEDULE_MODE=singleton이면 task가 끝날 때 스스로 다음 실행을 예약하고, beat는 예약이 끊겼을 때 다시 시작시키는 역할)
 celery_app.conf.beat_schedule = {
     "get-match-id-list": {
         "task": "tasks.get_match_id_list",
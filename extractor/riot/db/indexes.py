@@ -0,0 +1,79 @@
+from typing import Any, Dict, List, Set
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collection import Collection
+
+# match 컬렉션 인덱스 (transformer 조회 경로 기준)
+MATCH_INDEXES = [
+    # MatchDataExtractor.extract_match_features: gameMode 일치 + gameDuration 범위
+    IndexModel([("info.gameMode", ASCENDING), ("info.gameDuration", ASCENDING)], name="gameMode_gameDuration"),
+    # 패치별 조회
+    IndexModel([("info.gameVersion", ASCENDING)], name="gameVersion"),
+    # 기간별/최신순 조회
+    IndexModel([("info.gameCreation", DESCENDING)], name="gameCreation"),
+    # 플레이어(puuid)별 조회 (multikey)
+    IndexModel([("metadata.participants", ASCENDING)], name="participants"),
+]
+
+# 인덱스를 사용해야 하는 대표 조회 (explain으로 IXSCAN 여부 확인)
+READ_PATH_QUERIES: Dict[str, Dict[str, Any]] = {
+    "extract_match_features": {"info.gameMode": "ARAM", "info.gameDuration": {"$gte": 300}},
+    "matches_by_patch": {"info.gameVersion": {"$regex": r"^15\.1\."}},
+    "matches_since": {"info.gameCreation": {"$gte": 0}},
+    "matches_by_player": {"metadata.participants": ""},
+}
+
+
+def ensure_indexes(collection: Collection) -> List[str]:
+    """
+    match 컬렉션에 선언한 인덱스 생성 (이미 있으면 그대로 둠)
+
+    Args:
+        collection: match 컬렉션
+
+    Returns:
+        List[str]: 인덱스 이름 목록
+    """
+    return collection.create_indexes(MATCH_INDEXES)
+
+
+def _plan_stages(plan: Any) -> Set[str]:
+    """실행 계획 트리에 포함된 stage 이름 (inputStage/inputStages/queryPlan 등 중첩 구조 모두 탐색)"""
+    stages = set()
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= _plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            stages |= _plan_stages(value)
+    return stages
+
+
+def check_index_usage(collection: Collection) -> Dict[str, str]:
+    """
+    READ_PATH_QUERIES를 explain해서 인덱스 사용 여부 확인
+
+    Args:
+        collection: match 컬렉션
+
+    Returns:
+        Dict[str, str]: 조회 이름별 "IXSCAN" 또는 "COLLSCAN"
+    """
+    result = {}
+    for name, query in READ_PATH_QUERIES.items():
+        plan = collection.find(query).explain().get("queryPlanner", {}).get("winningPlan", {})
+        result[name] = "COLLSCAN" if "COLLSCAN" in _plan_stages(plan) else "IXSCAN"
+    return result
+
+
+if __name__ == "__main__":
+    from db.mongodb import MongoDBClient
+
+    client = MongoDBClient()
+    try:
+        print(f"인덱스: {client.ensure_indexes()}")
+        for query_name, stage in client.check_index_usage().items():
+            print(f"{query_name}: {stage}")
+    finally:
+        client.close()
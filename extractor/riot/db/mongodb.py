@@ -1,12 +1,232 @@
 import os
-from typing import Dict, Any, Optional
-from pymongo import MongoClient
+import time
+import queue
+import asyncio
+import threading
+import importlib.util
+from concurrent.futures import Future, InvalidStateError
+from typing import Dict, Any, List, Optional, Set, Tuple
+import bson
+from bson.binary import Binary
+from pymongo import InsertOne, MongoClient, ReplaceOne
 from pymongo.collection import Collection
 from pymongo.database import Database
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from dotenv import load_dotenv
+from db.projection import SCHEMA_FIELD, SCHEMA_HASH_FIELD, project_match, project_timeline, schema_fields
+from db import indexes
 
 load_dotenv()
 
+# 저장 방식 (insert: 끝난 match는 바뀌지 않으므로 이미 있으면 건너뜀, upsert: 항상 교체)
+MONGO_WRITE_MODE = os.getenv("MONGO_WRITE_MODE", "insert").lower()
+
+# MongoDB duplicate key 에러 코드 (_id가 이미 있는 document insert)
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# timeline 저장 방식 (split: match_detail 컬렉션에 따로 저장, embedded: match document의 "timeline" 아래에 저장)
+TIMELINE_STORAGE = os.getenv("MONGO_TIMELINE_STORAGE", "split").lower()
+
+# split 모드에서 timeline을 zstd로 압축한 BSON binary로 저장 (zstandard 패키지가 설치된 경우에만 사용)
+TIMELINE_COMPRESSION = (
+    os.getenv("MONGO_TIMELINE_COMPRESSION", "zstd").lower() == "zstd"
+    and importlib.util.find_spec("zstandard") is not None
+)
+TIMELINE_ZSTD_LEVEL = int(os.getenv("MONGO_TIMELINE_ZSTD_LEVEL", 3))
+
+# 압축한 timeline document의 encoding 표시
+TIMELINE_ENCODING_ZSTD = "zstd+bson"
+
+# bulk_write 한 번에 보낼 최대 document 수
+BULK_WRITE_BATCH_SIZE = int(os.getenv("MONGO_BULK_BATCH_SIZE", 100))
+
+# 첫 document가 들어온 뒤 batch가 차지 않아도 flush할 때까지 기다리는 시간 (초)
+BULK_WRITE_FLUSH_SECONDS = float(os.getenv("MONGO_BULK_FLUSH_SECONDS", 0.5))
+
+
+def summarize_timeline(timeline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    압축한 timeline과 함께 저장할 작은 요약 (압축 해제 없이 조회 가능)
+
+    Args:
+        timeline: Riot API에서 가져온 timeline 데이터
+
+    Returns:
+        Dict[str, Any]: frame 간격/개수, 참가자, 게임 종료 결과
+    """
+    info = timeline.get("info", {})
+    return {
+        "frameInterval": info.get("frameInterval"),
+        "frameCount": len(info.get("frames", [])),
+        "participants": info.get("participants", []),
+        "endOfGameResult": info.get("endOfGameResult"),
+    }
+
+
+def build_timeline_document(match_id: str, timeline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    match_detail 컬렉션에 저장할 timeline document 생성
+
+    Args:
+        match_id: Riot API match_id
+        timeline: Riot API에서 가져온 timeline 데이터
+
+    Returns:
+        Dict[str, Any]: 압축 설정 시 {_id, _schema, _schema_hash, encoding, data, size, summary}, 아니면 {_id, **timeline, _schema, _schema_hash}
+        (timeline에는 projection spec이 적용됨)
+    """
+    timeline = project_timeline(timeline)
+
+    if not TIMELINE_COMPRESSION:
+        return {"_id": match_id, **timeline, **schema_fields()}
+
+    import zstandard
+
+    raw = bson.encode(timeline)
+    return {
+        "_id": match_id,
+        **schema_fields(),
+        "encoding": TIMELINE_ENCODING_ZSTD,
+        "data": Binary(zstandard.ZstdCompressor(level=TIMELINE_ZSTD_LEVEL).compress(raw)),
+        "size": len(raw),
+        "summary": summarize_timeline(timeline),
+    }
+
+
+def read_timeline_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    match_detail 컬렉션 document에서 timeline 복원
+
+    Args:
+        document: build_timeline_document로 저장한 document
+
+    Returns:
+        Dict[str, Any]: Riot API timeline 데이터
+    """
+    if document.get("encoding") == TIMELINE_ENCODING_ZSTD:
+        import zstandard
+
+        return bson.decode(zstandard.ZstdDecompressor().decompress(document["data"]))
+    return {key: value for key, value in document.items() if key not in ("_id", SCHEMA_FIELD, SCHEMA_HASH_FIELD)}
+
+
+class MongoBulkWriter:
+    """
+    document를 모아 unordered bulk_write로 저장하는 백그라운드 writer (전용 스레드)
+
+    - BULK_WRITE_BATCH_SIZE개가 모이거나 BULK_WRITE_FLUSH_SECONDS가 지나면 flush한다.
+    - submit은 document별 저장 성공 여부를 돌려주는 Future를 반환한다.
+    - insert_only면 InsertOne으로 저장하고, 이미 있는 _id(duplicate key 에러)는 성공으로 본다.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        batch_size: int = BULK_WRITE_BATCH_SIZE,
+        flush_seconds: float = BULK_WRITE_FLUSH_SECONDS,
+        insert_only: bool = False
+    ):
+        """
+        Args:
+            collection: 저장할 MongoDB 컬렉션
+            batch_size: bulk_write 한 번에 보낼 최대 document 수
+            flush_seconds: batch가 차지 않아도 flush할 때까지 기다리는 시간 (초)
+            insert_only: True면 insert만 하고 이미 있는 document는 그대로 둠
+        """
+        self.collection = collection
+        self.insert_only = insert_only
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="mongo-bulk-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, document: Dict[str, Any]) -> Future:
+        """
+        document 저장 요청 (insert_only가 아니면 _id 기준 upsert)
+
+        Args:
+            document: _id가 있는 document
+
+        Returns:
+            Future: 저장 성공 여부(bool)
+        """
+        future = Future()
+        if not self._thread.is_alive():
+            # 종료된 writer에 보낸 요청은 기다리지 않도록 바로 실패 처리
+            future.set_result(False)
+            return future
+        self._queue.put((document, future))
+        return future
+
+    def close(self):
+        """남은 document를 모두 저장하고 스레드 종료"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        batch: List[Tuple[Dict[str, Any], Future]] = []
+        deadline = None
+        closed = False
+
+        while not closed:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if item is None:
+                closed = True
+            elif item:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+
+            if batch and (closed or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                try:
+                    self._flush(batch)
+                except Exception as e:
+                    # 예상하지 못한 에러로 스레드가 죽으면 기다리는 쪽이 영원히 멈추므로 batch만 실패 처리
+                    print(f"Error in MongoDB bulk writer: {str(e)}")
+                    for _, future in batch:
+                        self._resolve(future, False)
+                batch = []
+                deadline = None
+
+    def _flush(self, batch: List[Tuple[Dict[str, Any], Future]]):
+        """batch를 unordered bulk_write로 저장하고 document별 결과를 Future에 전달"""
+        if self.insert_only:
+            operations = [InsertOne(document) for document, _ in batch]
+        else:
+            operations = [ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document, _ in batch]
+        failed = set()
+
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                # insert 모드에서 이미 있는 match는 저장된 것으로 봄
+                if self.insert_only and error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                    continue
+                failed.add(error["index"])
+                print(f"Error saving {batch[error['index']][0]['_id']} to MongoDB: {error.get('errmsg')}")
+        except Exception as e:
+            print(f"Error in MongoDB bulk write: {str(e)}")
+            failed = set(range(len(batch)))
+
+        for index, (_, future) in enumerate(batch):
+            self._resolve(future, index not in failed)
+
+    @staticmethod
+    def _resolve(future: Future, saved: bool):
+        """Future에 저장 결과 전달 (기다리던 쪽이 취소했거나 이미 결과가 있으면 무시)"""
+        try:
+            future.set_result(saved)
+        except InvalidStateError:
+            pass
+
 
 class MongoDBClient:
     """MongoDB 연결 및 match 데이터 저장을 위한 클래스"""
@@ -23,16 +243,61 @@ class MongoDBClient:
         self.collection: Collection = self.db[self.collection_name]
         self.timeline_collection_name = "match_detail"
         self.timeline_collection: Collection = self.db[self.timeline_collection_name]
+        self.insert_only = MONGO_WRITE_MODE == "insert"
+        self._writers: Dict[str, MongoBulkWriter] = {}
+        self._writer_lock = threading.Lock()
+
+    def _writer(self, collection: Collection) -> MongoBulkWriter:
+        """컬렉션별 bulk writer (처음 사용할 때 스레드 시작)"""
+        with self._writer_lock:
+            writer = self._writers.get(collection.name)
+            if writer is None:
+                writer = self._writers[collection.name] = MongoBulkWriter(collection, insert_only=self.insert_only)
+            return writer
+
+    async def save_match_async(self, match_detail: Dict[str, Any], timeline: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        match 상세 데이터(+ timeline)를 bulk writer로 저장 (이벤트 루프를 막지 않음)
+
+        split 모드에서는 timeline을 match_detail 컬렉션에 먼저 저장하고, 성공한 경우에만 match를 저장한다.
+        (match가 있으면 timeline도 있다는 것이 보장되어, 이미 저장된 match를 건너뛰어도 timeline이 빠지지 않음)
+
+        Args:
+            match_detail: Riot API에서 가져온 match 상세 데이터
+            timeline: Riot API에서 가져온 timeline 데이터 (없으면 None)
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        match_id = match_detail.get("metadata", {}).get("matchId")
+
+        if not match_id:
+            print("Warning: match_detail에 matchId가 없습니다.")
+            return False
+
+        # 필요 없는 필드는 제외하고 projection 버전/spec hash 기록
+        document = {"_id": match_id, **project_match(match_detail), **schema_fields()}
+
+        # timeline projection/BSON 인코딩/압축은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        loop = asyncio.get_running_loop()
+        if timeline and TIMELINE_STORAGE == "split":
+            timeline_document = await loop.run_in_executor(None, build_timeline_document, match_id, timeline)
+            if not await asyncio.wrap_future(self._writer(self.timeline_collection).submit(timeline_document)):
+                return False
+        elif timeline:
+            document["timeline"] = await loop.run_in_executor(None, project_timeline, timeline)
+
+        return await asyncio.wrap_future(self._writer(self.collection).submit(document))
     
     def save_match(self, match_detail: Dict[str, Any]) -> bool:
         """
-        match 상세 데이터를 MongoDB에 저장 (upsert)
+        match 상세 데이터를 MongoDB에 저장 (insert 모드: 이미 있으면 그대로 둠, upsert 모드: 교체)
         
         Args:
             match_detail: Riot API에서 가져온 match 상세 데이터
             
         Returns:
-            bool: 저장 성공 여부
+            bool: 저장 성공 여부 (이미 저장된 match도 성공)
         """
         try:
             # match_id를 _id로 사용
@@ -42,25 +307,14 @@ class MongoDBClient:
                 print("Warning: match_detail에 matchId가 없습니다.")
                 return False
             
-            # _id 필드에 match_id 설정하고 나머지 데이터 저장
+            # _id 필드에 match_id 설정하고 나머지 데이터 저장 (필요 없는 필드는 제외하고 projection 버전/spec hash 기록)
             document = {
                 "_id": match_id,
-                **match_detail
+                **project_match(match_detail),
+                **schema_fields()
             }
             
-            # upsert 실행 (이미 있으면 업데이트, 없으면 삽입)
-            result = self.collection.replace_one(
-                {"_id": match_id},
-                document,
-                upsert=True
-            )
-            
-            if result.upserted_id or result.modified_count > 0:
-                print(f"Match 데이터 저장 완료: {match_id}")
-                return True
-            else:
-                print(f"Match 데이터 저장 실패 (변경 없음): {match_id}")
-                return False
+            return self._save(self.collection, document, "Match")
                 
         except Exception as e:
             print(f"Error saving match to MongoDB: {str(e)}")
@@ -68,46 +322,115 @@ class MongoDBClient:
     
     def save_match_timeline(self, match_id: str, timeline_data: Dict[str, Any]) -> bool:
         """
-        match timeline 데이터를 MongoDB의 match_detail 컬렉션에 저장 (upsert)
+        match timeline 데이터를 MongoDB의 match_detail 컬렉션에 저장 (insert 모드: 이미 있으면 그대로 둠, upsert 모드: 교체)
         
         Args:
             match_id: Riot API match_id
             timeline_data: Riot API에서 가져온 timeline 데이터
             
         Returns:
-            bool: 저장 성공 여부
+            bool: 저장 성공 여부 (이미 저장된 timeline도 성공)
         """
         try:
             if not match_id:
                 print("Warning: match_id가 없습니다.")
                 return False
             
-            # _id 필드에 match_id 설정하고 나머지 데이터 저장
-            document = {
-                "_id": match_id,
-                **timeline_data
-            }
-            
-            # upsert 실행 (이미 있으면 업데이트, 없으면 삽입)
-            result = self.timeline_collection.replace_one(
-                {"_id": match_id},
-                document,
-                upsert=True
-            )
+            # _id 필드에 match_id 설정하고 나머지 데이터 저장 (압축 설정 시 zstd BSON binary + 요약)
+            document = build_timeline_document(match_id, timeline_data)
             
-            if result.upserted_id or result.modified_count > 0:
-                print(f"Match timeline 데이터 저장 완료: {match_id}")
-                return True
-            else:
-                print(f"Match timeline 데이터 저장 실패 (변경 없음): {match_id}")
-                return False
+            return self._save(self.timeline_collection, document, "Match timeline")
                 
         except Exception as e:
             print(f"Error saving match timeline to MongoDB: {str(e)}")
             return False
+
+    def _save(self, collection: Collection, document: Dict[str, Any], label: str) -> bool:
+        """
+        document 1개 저장 (insert 모드는 _id unique index로 중복을 걸러냄)
+
+        Args:
+            collection: 저장할 컬렉션
+            document: _id가 있는 document
+            label: 로그용 이름
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        match_id = document["_id"]
+
+        if self.insert_only:
+            try:
+                collection.insert_one(document)
+            except DuplicateKeyError:
+                print(f"{label} 데이터가 이미 있습니다: {match_id}")
+                return True
+        else:
+            # upsert 실행 (이미 있으면 교체, 없으면 삽입, 내용이 같아도 성공)
+            collection.replace_one({"_id": match_id}, document, upsert=True)
+
+        print(f"{label} 데이터 저장 완료: {match_id}")
+        return True
+
+    def get_match_timeline(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """
+        match_detail 컬렉션에서 timeline 조회 (압축된 경우 해제)
+
+        match_detail에 없으면 match document의 "timeline" 키에서 조회한다.
+        (MONGO_TIMELINE_STORAGE=embedded로 저장했거나, 저장 방식을 바꾸기 전에 저장한 match)
+
+        Args:
+            match_id: Riot API match_id
+
+        Returns:
+            Optional[Dict[str, Any]]: timeline 데이터, 없으면 None
+        """
+        document = self.timeline_collection.find_one({"_id": match_id})
+        if document is not None:
+            return read_timeline_document(document)
+
+        document = self.collection.find_one({"_id": match_id}, {"timeline": 1})
+        if document is None:
+            return None
+        return document.get("timeline")
+
+    def existing_match_ids(self, match_ids: List[str]) -> Set[str]:
+        """
+        이미 저장된 match_id 조회 (_id index만 사용)
+
+        Args:
+            match_ids: 확인할 match_id 리스트
+
+        Returns:
+            Set[str]: match 컬렉션에 이미 있는 match_id
+        """
+        if not match_ids:
+            return set()
+        cursor = self.collection.find({"_id": {"$in": list(match_ids)}}, {"_id": 1})
+        return {document["_id"] for document in cursor}
+
+    def ensure_indexes(self) -> List[str]:
+        """
+        match 컬렉션에 transformer 조회용 인덱스 생성 (db/indexes.py의 MATCH_INDEXES)
+
+        Returns:
+            List[str]: 인덱스 이름 목록
+        """
+        return indexes.ensure_indexes(self.collection)
+
+    def check_index_usage(self) -> Dict[str, str]:
+        """
+        transformer 조회 경로가 인덱스를 타는지 explain으로 확인
+
+        Returns:
+            Dict[str, str]: 조회 이름별 "IXSCAN" 또는 "COLLSCAN"
+        """
+        return indexes.check_index_usage(self.collection)
     
     def close(self):
-        """MongoDB 연결 종료"""
+        """MongoDB 연결 종료 (bulk writer에 남은 document는 저장 후 종료)"""
+        for writer in self._writers.values():
+            writer.close()
         self.client.close()
 
 
@@ -122,3 +445,10 @@ def get_mongodb_client() -> MongoDBClient:
         _mongodb_client = MongoDBClient()
     return _mongodb_client
 
+
+def close_mongodb_client():
+    """MongoDB 클라이언트 싱글톤 정리 (worker 프로세스 종료 시 호출)"""
+    global _mongodb_client
+    if _mongodb_client is not None:
+        _mongodb_client.close()
+    _mongodb_client = None
@@ -0,0 +1,202 @@
+import os
+import hashlib
+from typing import Any, Dict, List, Optional, Union
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 저장 전에 적용할 필드 spec (쉼표로 구분, "-경로"는 제외, "+경로"는 그 경로만 남김, "*"는 리스트의 모든 원소/dict의 모든 값)
+# spec을 바꾸면 PROJECTION_VERSION도 올려서 document에 어떤 필드가 들어있는지 구분한다.
+# (버전을 올리지 않아도 spec에서 계산한 hash가 _schema_hash 필드에 함께 기록되어 구분할 수 있음)
+#   v1: 참가자 perks/missions, timeline frame별 championStats/damageStats 제외
+DEFAULT_MATCH_PROJECTION = "-info.participants.*.perks,-info.participants.*.missions"
+DEFAULT_TIMELINE_PROJECTION = (
+    "-info.frames.*.participantFrames.*.championStats,"
+    "-info.frames.*.participantFrames.*.damageStats"
+)
+
+# projection 사용 여부와 버전 (document의 _schema 필드에 기록)
+PROJECTION_ENABLED = os.getenv("PROJECTION_ENABLED", "true").lower() == "true"
+PROJECTION_VERSION = int(os.getenv("PROJECTION_VERSION", 1))
+
+# 버전과 spec hash를 기록할 document 필드
+SCHEMA_FIELD = "_schema"
+SCHEMA_HASH_FIELD = "_schema_hash"
+
+# spec hash 길이 (hex 문자 수)
+SCHEMA_HASH_LENGTH = 8
+
+# 경로 트리 (leaf는 True)
+PathTree = Dict[str, Union["PathTree", bool]]
+
+
+def _build_tree(paths: List[str]) -> PathTree:
+    """점으로 구분한 경로 목록을 트리로 변환"""
+    tree: PathTree = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is True:
+                break
+            node = child
+        else:
+            node[parts[-1]] = True
+    return tree
+
+
+def _merge(left: Union[PathTree, bool], right: Union[PathTree, bool]) -> Union[PathTree, bool]:
+    """두 경로 트리 병합 (어느 한쪽이 leaf면 leaf)"""
+    if left is True or right is True:
+        return True
+    merged = dict(left)
+    for name, subtree in right.items():
+        merged[name] = _merge(merged[name], subtree) if name in merged else subtree
+    return merged
+
+
+def _child(tree: PathTree, key: str) -> Optional[Union[PathTree, bool]]:
+    """key에 해당하는 하위 트리 (key와 "*" 규칙 병합, 둘 중 하나라도 leaf면 True)"""
+    child = None
+    for name in (key, "*"):
+        if name in tree:
+            child = tree[name] if child is None else _merge(child, tree[name])
+    return child
+
+
+def _list_tree(tree: PathTree) -> Union[PathTree, bool]:
+    """리스트 원소에 적용할 트리 ("*"가 없으면 리스트를 건너뛰고 같은 트리 적용)"""
+    return tree["*"] if "*" in tree else tree
+
+
+def _exclude(value: Any, tree: PathTree) -> Any:
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            child = _child(tree, key)
+            if child is True:
+                continue
+            result[key] = item if child is None else _exclude(item, child)
+        return result
+    if isinstance(value, list):
+        child = _list_tree(tree)
+        if child is True:
+            return []
+        return [_exclude(item, child) for item in value]
+    return value
+
+
+def _include(value: Any, tree: PathTree) -> Any:
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            child = _child(tree, key)
+            if child is None:
+                continue
+            result[key] = item if child is True else _include(item, child)
+        return result
+    if isinstance(value, list):
+        child = _list_tree(tree)
+        if child is True:
+            return value
+        return [_include(item, child) for item in value]
+    return value
+
+
+class ProjectionSpec:
+    """저장 전에 payload에서 필요한 필드만 남기는 whitelist/blacklist spec"""
+
+    def __init__(self, spec: str, version: int = PROJECTION_VERSION):
+        """
+        Args:
+            spec: 쉼표로 구분한 경로 목록 ("-경로": 제외, "+경로" 또는 "경로": 그 경로만 남김)
+            version: spec 버전 (document의 _schema 필드에 기록)
+        """
+        entries = [entry.strip() for entry in spec.split(",") if entry.strip()]
+        self.spec = spec
+        self.entries = entries
+        self.version = version
+        self._include = _build_tree([entry.lstrip("+") for entry in entries if not entry.startswith("-")])
+        self._exclude = _build_tree([entry[1:] for entry in entries if entry.startswith("-")])
+
+    def apply(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        spec을 적용한 새 document 반환 (원본은 수정하지 않음)
+
+        Args:
+            document: Riot API payload
+
+        Returns:
+            Dict[str, Any]: whitelist가 있으면 그 경로만, blacklist 경로는 제외한 document
+        """
+        if self._include:
+            document = _include(document, self._include)
+        if self._exclude:
+            document = _exclude(document, self._exclude)
+        return document
+
+    def canonical(self) -> str:
+        """공백과 경로 순서에 상관없이 같은 spec이면 같은 문자열 ("+" 생략 표기도 통일)"""
+        return ",".join(sorted(entry if entry.startswith("-") else entry.lstrip("+") for entry in self.entries))
+
+
+MATCH_PROJECTION = ProjectionSpec(os.getenv("MATCH_PROJECTION", DEFAULT_MATCH_PROJECTION))
+TIMELINE_PROJECTION = ProjectionSpec(os.getenv("TIMELINE_PROJECTION", DEFAULT_TIMELINE_PROJECTION))
+
+
+def project_match(match_detail: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    match detail에 projection 적용 (PROJECTION_ENABLED=false면 그대로 반환)
+
+    Args:
+        match_detail: Riot API에서 가져온 match 상세 데이터
+
+    Returns:
+        Dict[str, Any]: 저장할 match 데이터
+    """
+    return MATCH_PROJECTION.apply(match_detail) if PROJECTION_ENABLED else match_detail
+
+
+def project_timeline(timeline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    timeline에 projection 적용 (PROJECTION_ENABLED=false면 그대로 반환)
+
+    Args:
+        timeline: Riot API에서 가져온 timeline 데이터
+
+    Returns:
+        Dict[str, Any]: 저장할 timeline 데이터
+    """
+    return TIMELINE_PROJECTION.apply(timeline) if PROJECTION_ENABLED else timeline
+
+
+def schema_version() -> int:
+    """document의 _schema 필드에 기록할 버전 (projection을 쓰지 않으면 0)"""
+    return PROJECTION_VERSION if PROJECTION_ENABLED else 0
+
+
+def spec_hash(match_projection: ProjectionSpec, timeline_projection: ProjectionSpec) -> str:
+    """
+    match/timeline spec으로 계산한 짧은 hash
+
+    Args:
+        match_projection: match spec
+        timeline_projection: timeline spec
+
+    Returns:
+        str: SCHEMA_HASH_LENGTH 길이의 hex 문자열
+    """
+    canonical = f"match:{match_projection.canonical()}\ntimeline:{timeline_projection.canonical()}"
+    return hashlib.sha1(canonical.encode()).hexdigest()[:SCHEMA_HASH_LENGTH]
+
+
+def schema_fields() -> Dict[str, Any]:
+    """
+    document에 기록할 projection 버전과 spec hash (projection을 쓰지 않으면 hash는 None)
+
+    Returns:
+        Dict[str, Any]: {_schema: 버전, _schema_hash: spec hash}
+    """
+    digest = spec_hash(MATCH_PROJECTION, TIMELINE_PROJECTION) if PROJECTION_ENABLED else None
+    return {SCHEMA_FIELD: schema_version(), SCHEMA_HASH_FIELD: digest}
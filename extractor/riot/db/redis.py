@@ -1,13 +1,266 @@
 import os
 import redis
-from typing import Optional
+import redis.asyncio
+from typing import List, Optional
+from urllib.parse import quote
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 만료 시각 ZSET에서 만료된 항목을 조금씩 정리 (한 번에 최대 100개, 블로킹 방지)
+# now_ms, expiry_key 변수가 정의된 스크립트 안에서 사용
+TRIM_EXPIRED_LUA = """
+local expired = redis.call('ZRANGEBYSCORE', expiry_key, '-inf', now_ms, 'LIMIT', 0, 100)
+if #expired > 0 then
+    redis.call('ZREM', expiry_key, unpack(expired))
+end
+"""
+
+# Redis 서버 시각 (밀리초)
+NOW_MS_LUA = """
+local time = redis.call('TIME')
+local now_ms = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+"""
+
+# 아이템 추가 (만료 ZSET 체크 + SADD + LPUSH + ZADD를 한 번에 원자적으로 실행)
+# KEYS: [SET 키, LIST 키, 만료 시각 ZSET 키]
+# ARGV: [아이템, TTL(초, 없으면 빈 문자열)]
+ADD_SCRIPT = NOW_MS_LUA + """
+local expiry_key = KEYS[3]
+local ttl = ARGV[2]
+if ttl ~= '' then
+""" + TRIM_EXPIRED_LUA + """
+    local expires_at = redis.call('ZSCORE', expiry_key, ARGV[1])
+    if expires_at and tonumber(expires_at) > now_ms then
+        return 0
+    end
+end
+if redis.call('SADD', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('LPUSH', KEYS[2], ARGV[1])
+if ttl ~= '' then
+    redis.call('ZADD', expiry_key, now_ms + tonumber(ttl) * 1000, ARGV[1])
+end
+return 1
+"""
+
+# 아이템 꺼내기 (RPOP + SREM + 만료 ZSET ZREM을 한 번에 원자적으로 실행)
+# KEYS: [LIST 키, SET 키, 만료 시각 ZSET 키]
+GET_SCRIPT = """
+local item = redis.call('RPOP', KEYS[1])
+if not item then
+    return false
+end
+redis.call('SREM', KEYS[2], item)
+redis.call('ZREM', KEYS[3], item)
+return item
+"""
+
+# 여러 아이템 추가 (아이템별 추가 여부 반환)
+# KEYS: [SET 키, LIST 키, 만료 시각 ZSET 키]
+# ARGV: [TTL(초, 없으면 빈 문자열), 아이템...]
+ADD_MANY_SCRIPT = NOW_MS_LUA + """
+local expiry_key = KEYS[3]
+local ttl = ARGV[1]
+if ttl ~= '' then
+""" + TRIM_EXPIRED_LUA + """
+end
+local added = {}
+for i = 2, #ARGV do
+    local item = ARGV[i]
+    added[i - 1] = 0
+    local expires_at = false
+    if ttl ~= '' then
+        expires_at = redis.call('ZSCORE', expiry_key, item)
+    end
+    if not expires_at or tonumber(expires_at) <= now_ms then
+        if redis.call('SADD', KEYS[1], item) == 1 then
+            redis.call('LPUSH', KEYS[2], item)
+            if ttl ~= '' then
+                redis.call('ZADD', expiry_key, now_ms + tonumber(ttl) * 1000, item)
+            end
+            added[i - 1] = 1
+        end
+    end
+end
+return added
+"""
+
+# 여러 아이템 꺼내기 (FIFO 순서)
+# KEYS: [LIST 키, SET 키, 만료 시각 ZSET 키]
+# ARGV: [개수]
+POP_MANY_SCRIPT = """
+local items = redis.call('RPOP', KEYS[1], ARGV[1])
+if not items then
+    return {}
+end
+for _, item in ipairs(items) do
+    redis.call('SREM', KEYS[2], item)
+    redis.call('ZREM', KEYS[3], item)
+end
+return items
+"""
+
+# 만료된 TTL 항목 정리
+# KEYS: [만료 시각 ZSET 키]
+# ARGV: [최대 정리 개수]
+TRIM_SCRIPT = NOW_MS_LUA + """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now_ms, 'LIMIT', 0, tonumber(ARGV[1]))
+if #expired > 0 then
+    redis.call('ZREM', KEYS[1], unpack(expired))
+end
+return #expired
+"""
+
+# 여러 아이템을 lease로 꺼내기 (LIST -> processing LIST, 만료 시각은 lease ZSET에 기록)
+# SET에는 남겨 두어 처리 중인 아이템이 다시 추가되지 않도록 한다
+# KEYS: [LIST 키, processing LIST 키, lease ZSET 키]
+# ARGV: [개수, visibility timeout(ms)]
+LEASE_MANY_SCRIPT = """
+local now = redis.call('TIME')
+local expiry = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000) + tonumber(ARGV[2])
+local items = {}
+for i = 1, tonumber(ARGV[1]) do
+    local item = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+    if not item then
+        break
+    end
+    redis.call('ZADD', KEYS[3], expiry, item)
+    items[#items + 1] = item
+end
+return items
+"""
+
+# lease 처리 완료 (processing LIST, lease ZSET, SET, 시도 횟수에서 제거)
+# KEYS: [processing LIST 키, lease ZSET 키, SET 키, 시도 횟수 HASH 키, 만료 시각 ZSET 키]
+# ARGV: [아이템...]
+ACK_SCRIPT = """
+for i = 1, #ARGV do
+    local item = ARGV[i]
+    redis.call('LREM', KEYS[1], 1, item)
+    redis.call('ZREM', KEYS[2], item)
+    redis.call('SREM', KEYS[3], item)
+    redis.call('HDEL', KEYS[4], item)
+    redis.call('ZREM', KEYS[5], item)
+end
+return #ARGV
+"""
+
+# lease 처리 실패 (시도 횟수 증가 후 큐 뒤쪽으로, 초과 시 dead-letter 큐로 이동)
+# KEYS: [processing LIST 키, lease ZSET 키, 시도 횟수 HASH 키, dead-letter LIST 키, SET 키, LIST 키]
+# ARGV: [아이템, 최대 시도 횟수]
+NACK_SCRIPT = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then
+    return -1
+end
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+local attempts = redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('HDEL', KEYS[3], ARGV[1])
+    redis.call('SREM', KEYS[5], ARGV[1])
+    redis.call('LPUSH', KEYS[4], ARGV[1])
+    return 0
+end
+redis.call('LPUSH', KEYS[6], ARGV[1])
+return 1
+"""
+
+# lease를 큐 앞쪽으로 되돌림 (시도 횟수는 그대로, 주어진 순서대로 다시 꺼내지도록 뒤에서부터 RPUSH)
+# ARGV가 없으면 만료된 lease 전체가 대상 (reaper)
+# KEYS: [lease ZSET 키, processing LIST 키, LIST 키]
+# ARGV: [아이템...]
+RELEASE_SCRIPT = """
+local items = ARGV
+if #items == 0 then
+    local now = redis.call('TIME')
+    local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+    items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now_ms)
+end
+local released = 0
+for i = #items, 1, -1 do
+    local item = items[i]
+    if redis.call('ZREM', KEYS[1], item) == 1 then
+        redis.call('LREM', KEYS[2], 1, item)
+        redis.call('RPUSH', KEYS[3], item)
+        released = released + 1
+    end
+end
+return released
+"""
+
+
+# 프로세스당 Redis 최대 연결 수 (동기/비동기 pool 각각)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+
+# 전역 인스턴스 (worker 프로세스 단위로 connection pool 공유)
+_redis_pool: Optional[redis.ConnectionPool] = None
+_redis_client: Optional[redis.Redis] = None
+_async_redis_client: Optional[redis.asyncio.Redis] = None
+
+
+def get_redis_url() -> str:
+    """
+    환경 변수 기반 Redis URL 생성 (Celery broker/backend와 공유)
+
+    Returns:
+        str: redis:// URL
+    """
+    redis_host = os.getenv("REDIS_HOST", "localhost")
+    redis_port = int(os.getenv("REDIS_PORT", 6379))
+    redis_db = int(os.getenv("REDIS_DB", 0))
+    redis_password = os.getenv("REDIS_PASSWORD")
+
+    if redis_password:
+        return f"redis://:{quote(redis_password, safe='')}@{redis_host}:{redis_port}/{redis_db}"
+    return f"redis://{redis_host}:{redis_port}/{redis_db}"
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    프로세스 전역 connection pool을 사용하는 Redis 클라이언트 반환
+
+    Returns:
+        redis.Redis: decode_responses=True 로 설정된 Redis 클라이언트
+    """
+    global _redis_pool, _redis_client
+    if _redis_client is None:
+        _redis_pool = redis.ConnectionPool.from_url(
+            get_redis_url(),
+            max_connections=REDIS_MAX_CONNECTIONS,
+            decode_responses=True
+        )
+        _redis_client = redis.Redis(connection_pool=_redis_pool)
+    return _redis_client
+
+
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """
+    이벤트 루프에서 사용할 비동기 Redis 클라이언트 반환 (match.client의 전역 이벤트 루프에서 사용)
+
+    Returns:
+        redis.asyncio.Redis: decode_responses=True 로 설정된 비동기 Redis 클라이언트
+    """
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = redis.asyncio.Redis.from_url(
+            get_redis_url(),
+            max_connections=REDIS_MAX_CONNECTIONS,
+            decode_responses=True
+        )
+    return _async_redis_client
+
+
+async def close_async_redis_client():
+    """비동기 Redis 클라이언트 정리 (클라이언트를 만든 이벤트 루프에서 호출)"""
+    global _async_redis_client
+    if _async_redis_client is not None:
+        await _async_redis_client.aclose()
+    _async_redis_client = None
+
 
 class BaseRedisQueue:
-    """Redis LIST + SET을 사용한 FIFO 큐 Base 클래스 (중복 제거 + TTL 지원)"""
+    """Redis LIST + SET을 사용한 FIFO 큐 Base 클래스 (중복 제거 + 만료 시각 ZSET 기반 TTL 지원, add/get은 Lua 스크립트로 원자적 실행)"""
 
     def __init__(self, queue_key: str, set_key: str):
         """
@@ -17,21 +270,33 @@ class BaseRedisQueue:
             queue_key: Redis LIST 키 이름
             set_key: Redis SET 키 이름 (중복 제거용)
         """
-        redis_host = os.getenv("REDIS_HOST", "localhost")
-        redis_port = int(os.getenv("REDIS_PORT", 6379))
-        redis_db = int(os.getenv("REDIS_DB", 0))
-        redis_password = os.getenv("REDIS_PASSWORD")
-
-        self.redis_client = redis.Redis(
-            host=redis_host,
-            port=redis_port,
-            db=redis_db,
-            password=redis_password,
-            decode_responses=True
-        )
+        self.redis_client = get_redis_client()
 
         self.queue_key = queue_key
         self.set_key = set_key
+        self.attempts_key = f"{queue_key}:attempts"
+        self.dead_letter_key = f"{queue_key}:dead"
+        self.expiry_key = f"{set_key}:expiry"
+        self.legacy_ttl_key_prefix = f"{set_key}:ttl:"
+        self.processing_key = f"{queue_key}:processing"
+        self.lease_key = f"{queue_key}:leases"
+
+        self._add_script = self.redis_client.register_script(ADD_SCRIPT)
+        self._get_script = self.redis_client.register_script(GET_SCRIPT)
+        self._add_many_script = self.redis_client.register_script(ADD_MANY_SCRIPT)
+        self._pop_many_script = self.redis_client.register_script(POP_MANY_SCRIPT)
+        self._lease_many_script = self.redis_client.register_script(LEASE_MANY_SCRIPT)
+        self._ack_script = self.redis_client.register_script(ACK_SCRIPT)
+        self._nack_script = self.redis_client.register_script(NACK_SCRIPT)
+        self._release_script = self.redis_client.register_script(RELEASE_SCRIPT)
+        self._trim_script = self.redis_client.register_script(TRIM_SCRIPT)
+
+        # 이벤트 루프 안에서 호출하는 lease/ack/nack/release는 같은 스크립트를 비동기 클라이언트로 실행
+        self.async_redis_client = get_async_redis_client()
+        self._async_lease_many_script = self.async_redis_client.register_script(LEASE_MANY_SCRIPT)
+        self._async_ack_script = self.async_redis_client.register_script(ACK_SCRIPT)
+        self._async_nack_script = self.async_redis_client.register_script(NACK_SCRIPT)
+        self._async_release_script = self.async_redis_client.register_script(RELEASE_SCRIPT)
 
     def add(self, item: str, ttl: Optional[int] = None) -> bool:
         """
@@ -44,50 +309,183 @@ class BaseRedisQueue:
         Returns:
             bool: 추가 성공 여부 (이미 존재하면 False)
         """
-        # TTL이 지정된 경우, TTL 추적 키 체크
-        if ttl is not None:
-            ttl_key = f"{self.set_key}:ttl:{item}"
-            if self.redis_client.exists(ttl_key):
-                # TTL 키가 존재하면 아직 만료되지 않음 (중복)
-                return False
+        added = self._add_script(
+            keys=[self.set_key, self.queue_key, self.expiry_key],
+            args=[item, "" if ttl is None else ttl]
+        )
+        return bool(added)
 
-        # SET에 추가 시도 (중복 확인)
-        added = self.redis_client.sadd(self.set_key, item)
+    def get(self) -> Optional[str]:
+        """
+        큐에서 아이템을 가져옴 (FIFO)
 
-        if added:
-            # SET에 추가 성공 시 LIST에도 추가
-            self.redis_client.lpush(self.queue_key, item)
+        Returns:
+            Optional[str]: 가져온 아이템, 큐가 비어있으면 None
+        """
+        return self._get_script(keys=[self.queue_key, self.set_key, self.expiry_key])
 
-            # TTL이 지정된 경우, TTL 추적 키 생성
-            if ttl is not None:
-                ttl_key = f"{self.set_key}:ttl:{item}"
-                self.redis_client.setex(ttl_key, ttl, "1")
+    def add_many(self, items: List[str], ttl: Optional[int] = None) -> List[bool]:
+        """
+        여러 아이템을 한 번에 큐에 추가 (중복 제거)
 
-            return True
+        Args:
+            items: 추가할 아이템 리스트
+            ttl: TTL in seconds (None이면 TTL 없음, 영구 중복 제거)
 
-        return False
+        Returns:
+            List[bool]: 아이템별 추가 성공 여부 (이미 존재하면 False)
+        """
+        if not items:
+            return []
 
-    def get(self) -> Optional[str]:
+        added = self._add_many_script(
+            keys=[self.set_key, self.queue_key, self.expiry_key],
+            args=["" if ttl is None else ttl, *items]
+        )
+        return [bool(flag) for flag in added]
+
+    def pop_many(self, count: int) -> List[str]:
         """
-        큐에서 아이템을 가져옴 (FIFO)
+        큐에서 여러 아이템을 한 번에 가져옴 (FIFO)
+
+        Args:
+            count: 가져올 최대 개수
 
         Returns:
-            Optional[str]: 가져온 아이템, 큐가 비어있으면 None
+            List[str]: 가져온 아이템 리스트 (큐에 남은 개수가 적으면 그만큼만)
         """
-        # LIST에서 오른쪽에서 가져오기 (FIFO)
-        item = self.redis_client.rpop(self.queue_key)
+        if count <= 0:
+            return []
+        return self._pop_many_script(keys=[self.queue_key, self.set_key, self.expiry_key], args=[count])
 
-        if item:
-            # SET에서도 제거
-            self.redis_client.srem(self.set_key, item)
+    def lease_many(self, count: int, visibility_timeout: int) -> List[str]:
+        """
+        큐에서 여러 아이템을 lease로 가져옴 (at-least-once 처리용)
 
-            # TTL 추적 키가 존재하면 삭제
-            ttl_key = f"{self.set_key}:ttl:{item}"
-            self.redis_client.delete(ttl_key)
+        가져온 아이템은 ack 또는 nack 하기 전까지 processing LIST에 남아 있고,
+        visibility_timeout 안에 ack 되지 않으면 reap_expired()가 큐로 되돌린다.
 
-            return item
+        Args:
+            count: 가져올 최대 개수
+            visibility_timeout: lease 유지 시간 (초)
+
+        Returns:
+            List[str]: 가져온 아이템 리스트
+        """
+        if count <= 0:
+            return []
+        return self._lease_many_script(
+            keys=[self.queue_key, self.processing_key, self.lease_key],
+            args=[count, visibility_timeout * 1000]
+        )
+
+    def ack(self, *items: str):
+        """
+        lease로 가져온 아이템 처리 완료
+
+        Args:
+            items: 처리가 끝난 아이템
+        """
+        if items:
+            self._ack_script(
+                keys=[self.processing_key, self.lease_key, self.set_key, self.attempts_key, self.expiry_key],
+                args=list(items)
+            )
+
+    def nack(self, item: str, max_attempts: int) -> bool:
+        """
+        lease로 가져온 아이템 처리 실패 (큐 뒤쪽에 다시 추가, 시도 횟수 초과 시 dead-letter 큐로 이동)
+
+        Args:
+            item: 처리에 실패한 아이템
+            max_attempts: 최대 시도 횟수
+
+        Returns:
+            bool: 재시도 큐에 있으면 True (lease 만료로 이미 되돌려진 경우 포함), dead-letter 큐로 이동하면 False
+        """
+        requeued = self._nack_script(
+            keys=[
+                self.processing_key, self.lease_key, self.attempts_key,
+                self.dead_letter_key, self.set_key, self.queue_key
+            ],
+            args=[item, max_attempts]
+        )
+        return requeued != 0
+
+    def release(self, *items: str) -> int:
+        """
+        lease로 가져왔지만 처리하지 않은 아이템을 큐 앞쪽으로 되돌림 (시도 횟수 유지)
+
+        Args:
+            items: 되돌릴 아이템
+
+        Returns:
+            int: 되돌린 아이템 개수
+        """
+        if not items:
+            return 0
+        return self._release_script(keys=[self.lease_key, self.processing_key, self.queue_key], args=list(items))
+
+    def reap_expired(self) -> int:
+        """
+        visibility timeout이 지난 lease를 큐 앞쪽으로 되돌림 (worker가 죽은 경우 복구)
 
-        return None
+        Returns:
+            int: 되돌린 아이템 개수
+        """
+        return self._release_script(keys=[self.lease_key, self.processing_key, self.queue_key], args=[])
+
+    async def lease_many_async(self, count: int, visibility_timeout: int) -> List[str]:
+        """lease_many의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        if count <= 0:
+            return []
+        return await self._async_lease_many_script(
+            keys=[self.queue_key, self.processing_key, self.lease_key],
+            args=[count, visibility_timeout * 1000]
+        )
+
+    async def ack_async(self, *items: str):
+        """ack의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        if items:
+            await self._async_ack_script(
+                keys=[self.processing_key, self.lease_key, self.set_key, self.attempts_key, self.expiry_key],
+                args=list(items)
+            )
+
+    async def nack_async(self, item: str, max_attempts: int) -> bool:
+        """nack의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        requeued = await self._async_nack_script(
+            keys=[
+                self.processing_key, self.lease_key, self.attempts_key,
+                self.dead_letter_key, self.set_key, self.queue_key
+            ],
+            args=[item, max_attempts]
+        )
+        return requeued != 0
+
+    async def release_async(self, *items: str) -> int:
+        """release의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        if not items:
+            return 0
+        return await self._async_release_script(keys=[self.lease_key, self.processing_key, self.queue_key], args=list(items))
+
+    def processing_size(self) -> int:
+        """
+        lease로 처리 중인 아이템 개수 반환
+
+        Returns:
+            int: processing LIST에 있는 아이템 개수
+        """
+        return self.redis_client.llen(self.processing_key)
+
+    def dead_letter_size(self) -> int:
+        """
+        dead-letter 큐의 크기 반환
+
+        Returns:
+            int: 최대 시도 횟수를 넘겨 버려진 아이템 개수
+        """
+        return self.redis_client.llen(self.dead_letter_key)
 
     def queue_size(self) -> int:
         """
@@ -107,13 +505,36 @@ class BaseRedisQueue:
         """
         return self.redis_client.scard(self.set_key)
 
+    def trim_expired(self, limit: int = 1000) -> int:
+        """
+        만료 시각 ZSET에서 TTL이 지난 항목 정리 (add 시에도 조금씩 정리됨)
+
+        Args:
+            limit: 한 번에 정리할 최대 개수
+
+        Returns:
+            int: 정리된 항목 수
+        """
+        return self._trim_script(keys=[self.expiry_key], args=[limit])
+
     def clear(self):
-        """큐와 SET 모두 초기화"""
-        self.redis_client.delete(self.queue_key)
-        self.redis_client.delete(self.set_key)
-
-        # TTL 추적 키도 모두 삭제 (패턴 매칭)
-        ttl_pattern = f"{self.set_key}:ttl:*"
-        ttl_keys = self.redis_client.keys(ttl_pattern)
-        if ttl_keys:
-            self.redis_client.delete(*ttl_keys)
+        """큐와 SET 모두 초기화 (시도 횟수, dead-letter 큐, lease, 만료 ZSET 포함)"""
+        self.redis_client.unlink(
+            self.queue_key,
+            self.set_key,
+            self.attempts_key,
+            self.dead_letter_key,
+            self.processing_key,
+            self.lease_key,
+            self.expiry_key,
+        )
+
+        # 이전 방식의 아이템별 TTL 추적 키 정리 (KEYS 대신 SCAN으로 논블로킹 삭제)
+        batch = []
+        for key in self.redis_client.scan_iter(match=f"{self.legacy_ttl_key_prefix}*", count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            self.redis_client.unlink(*batch)
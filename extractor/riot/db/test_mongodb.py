@@ -0,0 +1,154 @@
+import os
+import sys
+
+# extractor/riot을 sys.path에 추가 (모듈이 "from db..." 형식으로 import함)
+riot_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, riot_root)
+
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+from db.mongodb import DUPLICATE_KEY_ERROR_CODE, MongoBulkWriter, MongoDBClient
+
+# 테스트에서 Future 결과를 기다리는 최대 시간 (초)
+RESULT_TIMEOUT_SECONDS = 5
+
+
+class FakeCollection:
+    """bulk_write 호출을 기록하고, 지정한 writeErrors나 예외를 돌려주는 컬렉션"""
+
+    def __init__(self, write_errors=None, error=None):
+        self.name = "match"
+        self.write_errors = write_errors or []
+        self.error = error
+        self.calls = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.calls.append((operations, ordered))
+        if self.error:
+            raise self.error
+        if self.write_errors:
+            raise BulkWriteError({"writeErrors": self.write_errors, "nInserted": len(operations) - len(self.write_errors)})
+
+
+def write_batch(writer, documents):
+    """documents를 submit하고 close로 flush한 뒤 document별 결과 반환"""
+    futures = [writer.submit(document) for document in documents]
+    writer.close()
+    return [future.result(timeout=RESULT_TIMEOUT_SECONDS) for future in futures]
+
+
+def test_upsert_mode_sends_unordered_replace_ones():
+    collection = FakeCollection()
+    writer = MongoBulkWriter(collection, batch_size=10, flush_seconds=60)
+
+    assert write_batch(writer, [{"_id": "KR_1"}, {"_id": "KR_2"}]) == [True, True]
+
+    operations, ordered = collection.calls[0]
+    assert ordered is False
+    assert all(isinstance(operation, ReplaceOne) for operation in operations)
+
+
+def test_partial_bulk_write_error_fails_only_those_documents():
+    collection = FakeCollection(write_errors=[{"index": 1, "code": 2, "errmsg": "bad document"}])
+    writer = MongoBulkWriter(collection, batch_size=10, flush_seconds=60)
+
+    assert write_batch(writer, [{"_id": "KR_1"}, {"_id": "KR_2"}, {"_id": "KR_3"}]) == [True, False, True]
+
+
+def test_insert_mode_treats_duplicate_key_as_saved():
+    collection = FakeCollection(write_errors=[
+        {"index": 0, "code": DUPLICATE_KEY_ERROR_CODE, "errmsg": "duplicate key"},
+        {"index": 2, "code": 121, "errmsg": "document failed validation"},
+    ])
+    writer = MongoBulkWriter(collection, batch_size=10, flush_seconds=60, insert_only=True)
+
+    assert write_batch(writer, [{"_id": "KR_1"}, {"_id": "KR_2"}, {"_id": "KR_3"}]) == [True, True, False]
+    assert all(isinstance(operation, InsertOne) for operation in collection.calls[0][0])
+
+
+def test_upsert_mode_does_not_ignore_duplicate_key():
+    collection = FakeCollection(write_errors=[{"index": 0, "code": DUPLICATE_KEY_ERROR_CODE, "errmsg": "duplicate key"}])
+    writer = MongoBulkWriter(collection, batch_size=10, flush_seconds=60)
+
+    assert write_batch(writer, [{"_id": "KR_1"}]) == [False]
+
+
+def test_connection_error_fails_whole_batch():
+    collection = FakeCollection(error=ConnectionError("server unavailable"))
+    writer = MongoBulkWriter(collection, batch_size=10, flush_seconds=60)
+
+    assert write_batch(writer, [{"_id": "KR_1"}, {"_id": "KR_2"}]) == [False, False]
+
+
+def test_flushes_when_batch_is_full():
+    collection = FakeCollection()
+    writer = MongoBulkWriter(collection, batch_size=2, flush_seconds=60)
+
+    futures = [writer.submit({"_id": f"KR_{index}"}) for index in range(2)]
+    assert [future.result(timeout=RESULT_TIMEOUT_SECONDS) for future in futures] == [True, True]
+    writer.close()
+    assert len(collection.calls) == 1
+
+
+def test_unexpected_error_fails_batch_and_keeps_writer_running():
+    collection = FakeCollection()
+    writer = MongoBulkWriter(collection, batch_size=1, flush_seconds=60)
+
+    # _id가 없으면 ReplaceOne을 만들 때 실패한다
+    assert writer.submit({"match_id": "KR_1"}).result(timeout=RESULT_TIMEOUT_SECONDS) is False
+    assert writer.submit({"_id": "KR_2"}).result(timeout=RESULT_TIMEOUT_SECONDS) is True
+    writer.close()
+
+
+def test_submit_after_close_fails_immediately():
+    writer = MongoBulkWriter(FakeCollection(), batch_size=10, flush_seconds=60)
+    writer.close()
+
+    assert writer.submit({"_id": "KR_1"}).result(timeout=RESULT_TIMEOUT_SECONDS) is False
+
+
+def test_cancelled_future_does_not_stop_writer():
+    writer = MongoBulkWriter(FakeCollection(), batch_size=2, flush_seconds=60)
+
+    cancelled = writer.submit({"_id": "KR_1"})
+    cancelled.cancel()
+    saved = writer.submit({"_id": "KR_2"})
+
+    assert saved.result(timeout=RESULT_TIMEOUT_SECONDS) is True
+    assert write_batch(writer, [{"_id": "KR_3"}]) == [True]
+
+
+class FindOneCollection:
+    """_id로 document를 돌려주는 컬렉션 (projection은 최상위 키만 지원)"""
+
+    def __init__(self, documents):
+        self.documents = {document["_id"]: document for document in documents}
+
+    def find_one(self, query, projection=None):
+        document = self.documents.get(query["_id"])
+        if document is None or projection is None:
+            return document
+        return {key: value for key, value in document.items() if key == "_id" or projection.get(key)}
+
+
+def client_with(matches, timelines):
+    """MONGO_DB_URL 연결 없이 컬렉션만 바꾼 MongoDBClient"""
+    client = MongoDBClient.__new__(MongoDBClient)
+    client.collection = FindOneCollection(matches)
+    client.timeline_collection = FindOneCollection(timelines)
+    return client
+
+
+def test_get_match_timeline_reads_match_detail_first():
+    client = client_with(
+        [{"_id": "KR_1", "timeline": {"info": {"frames": ["embedded"]}}}],
+        [{"_id": "KR_1", "info": {"frames": ["split"]}}],
+    )
+    assert client.get_match_timeline("KR_1") == {"info": {"frames": ["split"]}}
+
+
+def test_get_match_timeline_falls_back_to_embedded_timeline():
+    client = client_with([{"_id": "KR_1", "timeline": {"info": {"frames": []}}}, {"_id": "KR_2"}], [])
+    assert client.get_match_timeline("KR_1") == {"info": {"frames": []}}
+    assert client.get_match_timeline("KR_2") is None
+    assert client.get_match_timeline("KR_3") is None
@@ -0,0 +1,148 @@
+import os
+import sys
+import copy
+
+# extractor/riot을 sys.path에 추가 (모듈이 "from db..." 형식으로 import함)
+riot_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, riot_root)
+
+from db.projection import (
+    DEFAULT_MATCH_PROJECTION,
+    DEFAULT_TIMELINE_PROJECTION,
+    ProjectionSpec,
+    SCHEMA_HASH_LENGTH,
+    spec_hash,
+)
+
+
+def sample_match():
+    return {
+        "metadata": {"matchId": "KR_1", "participants": ["puuid-1", "puuid-2"]},
+        "info": {
+            "gameMode": "ARAM",
+            "gameDuration": 1200,
+            "participants": [
+                {"puuid": "puuid-1", "kills": 5, "perks": {"styles": []}, "missions": {"a": 1}, "challenges": {"kda": 3.5}},
+                {"puuid": "puuid-2", "kills": 2, "perks": {"styles": []}, "missions": {"a": 2}, "challenges": {"kda": 1.0}},
+            ],
+            "teams": [{"teamId": 100, "win": True}],
+        },
+    }
+
+
+def sample_timeline():
+    return {
+        "metadata": {"matchId": "KR_1"},
+        "info": {
+            "frames": [
+                {
+                    "timestamp": 60000,
+                    "participantFrames": {
+                        "1": {"totalGold": 500, "championStats": {"armor": 30}, "damageStats": {"totalDamageDone": 100}},
+                        "2": {"totalGold": 450, "championStats": {"armor": 25}, "damageStats": {"totalDamageDone": 80}},
+                    },
+                    "events": [{"type": "ITEM_PURCHASED"}],
+                }
+            ]
+        },
+    }
+
+
+def test_exclude_path():
+    spec = ProjectionSpec("-info.teams")
+    result = spec.apply(sample_match())
+    assert "teams" not in result["info"]
+    assert result["info"]["gameMode"] == "ARAM"
+    assert result["metadata"] == sample_match()["metadata"]
+
+
+def test_include_path():
+    spec = ProjectionSpec("+metadata.matchId,info.gameMode")
+    assert spec.apply(sample_match()) == {"metadata": {"matchId": "KR_1"}, "info": {"gameMode": "ARAM"}}
+
+
+def test_wildcard_over_list():
+    spec = ProjectionSpec("-info.participants.*.perks")
+    participants = spec.apply(sample_match())["info"]["participants"]
+    assert all("perks" not in participant for participant in participants)
+    assert [participant["kills"] for participant in participants] == [5, 2]
+
+
+def test_list_is_traversed_without_wildcard():
+    spec = ProjectionSpec("+info.participants.puuid")
+    assert spec.apply(sample_match())["info"]["participants"] == [{"puuid": "puuid-1"}, {"puuid": "puuid-2"}]
+
+
+def test_wildcard_over_dict():
+    spec = ProjectionSpec("-info.frames.*.participantFrames.*.championStats")
+    frames = spec.apply(sample_timeline())["info"]["frames"]
+    assert frames[0]["participantFrames"] == {
+        "1": {"totalGold": 500, "damageStats": {"totalDamageDone": 100}},
+        "2": {"totalGold": 450, "damageStats": {"totalDamageDone": 80}},
+    }
+
+
+def test_wildcard_merges_with_named_key():
+    spec = ProjectionSpec("-info.frames.*.participantFrames.*.championStats,-info.frames.*.participantFrames.1.totalGold")
+    frames = spec.apply(sample_timeline())["info"]["frames"]
+    assert frames[0]["participantFrames"]["1"] == {"damageStats": {"totalDamageDone": 100}}
+    assert frames[0]["participantFrames"]["2"] == {"totalGold": 450, "damageStats": {"totalDamageDone": 80}}
+
+
+def test_leaf_beats_subtree():
+    # 더 짧은 경로가 제외되면 그 아래 규칙과 상관없이 전체 제외
+    assert "participants" not in ProjectionSpec("-info.participants.*.perks,-info.participants").apply(sample_match())["info"]
+    assert "participants" not in ProjectionSpec("-info.participants,-info.participants.*.perks").apply(sample_match())["info"]
+
+    # 더 짧은 경로를 남기면 그 아래 전체를 남김
+    result = ProjectionSpec("+info.participants.*.kills,+info.participants").apply(sample_match())
+    assert result == {"info": {"participants": sample_match()["info"]["participants"]}}
+
+
+def test_include_and_exclude_together():
+    spec = ProjectionSpec("+metadata,+info.participants,-info.participants.*.perks,-info.participants.*.missions")
+    result = spec.apply(sample_match())
+    assert set(result) == {"metadata", "info"}
+    assert set(result["info"]) == {"participants"}
+    assert result["info"]["participants"][0] == {"puuid": "puuid-1", "kills": 5, "challenges": {"kda": 3.5}}
+
+
+def test_apply_does_not_modify_original():
+    document = sample_match()
+    original = copy.deepcopy(document)
+    ProjectionSpec("-info.participants.*.perks,+info").apply(document)
+    assert document == original
+
+
+def test_default_match_projection_keeps_challenges_and_metadata():
+    result = ProjectionSpec(DEFAULT_MATCH_PROJECTION).apply(sample_match())
+    assert result["metadata"] == sample_match()["metadata"]
+    assert result["info"]["teams"] == sample_match()["info"]["teams"]
+    for participant in result["info"]["participants"]:
+        assert "challenges" in participant
+        assert "perks" not in participant
+        assert "missions" not in participant
+
+
+def test_default_timeline_projection():
+    result = ProjectionSpec(DEFAULT_TIMELINE_PROJECTION).apply(sample_timeline())
+    frame = result["info"]["frames"][0]
+    assert frame["participantFrames"]["1"] == {"totalGold": 500}
+    assert frame["events"] == [{"type": "ITEM_PURCHASED"}]
+    assert result["metadata"] == {"matchId": "KR_1"}
+
+
+def test_spec_hash_changes_with_either_spec():
+    match, timeline = ProjectionSpec(DEFAULT_MATCH_PROJECTION), ProjectionSpec(DEFAULT_TIMELINE_PROJECTION)
+    digest = spec_hash(match, timeline)
+    assert len(digest) == SCHEMA_HASH_LENGTH
+
+    assert spec_hash(ProjectionSpec(DEFAULT_MATCH_PROJECTION + ",-info.teams"), timeline) != digest
+    assert spec_hash(match, ProjectionSpec("-info.frames.*.events")) != digest
+    # match spec과 timeline spec을 바꿔 넣어도 구분된다
+    assert spec_hash(ProjectionSpec("-a"), ProjectionSpec("-b")) != spec_hash(ProjectionSpec("-b"), ProjectionSpec("-a"))
+
+
+def test_spec_hash_ignores_whitespace_order_and_plus_prefix():
+    timeline = ProjectionSpec(DEFAULT_TIMELINE_PROJECTION)
+    assert spec_hash(ProjectionSpec("+metadata, -info.teams"), timeline) == spec_hash(ProjectionSpec("-info.teams,metadata"), timeline)
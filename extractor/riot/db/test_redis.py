@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import asyncio
+
+# extractor/riot을 sys.path에 추가 (모듈이 "from db..." 형식으로 import함)
+riot_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, riot_root)
+
+import fakeredis
+import pytest
+import db.redis as redis_module
+from db.redis import BaseRedisQueue
+
+
+@pytest.fixture
+def queue():
+    """fakeredis(Lua 지원)로 Lua 스크립트를 실행하는 테스트용 큐"""
+    # 동기/비동기 클라이언트가 같은 fake 서버를 보도록 공유
+    server = fakeredis.FakeServer()
+    previous = redis_module._redis_client, redis_module._async_redis_client
+    redis_module._redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    redis_module._async_redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    try:
+        yield BaseRedisQueue(queue_key="test_queue", set_key="test_set")
+    finally:
+        redis_module._redis_client, redis_module._async_redis_client = previous
+
+
+def test_add_deduplicates_and_get_is_fifo(queue):
+    assert queue.add("a") is True
+    assert queue.add("a") is False
+    assert queue.add_many(["b", "a", "c", "b"]) == [True, False, True, False]
+
+    assert queue.get() == "a"
+    assert queue.pop_many(10) == ["b", "c"]
+    assert queue.get() is None
+    assert queue.set_size() == 0
+
+
+def test_ttl_records_expiry_and_get_clears_it(queue):
+    assert queue.add("a", ttl=60) is True
+    assert queue.add_many(["a", "b"], ttl=60) == [False, True]
+    assert queue.redis_client.zcard(queue.expiry_key) == 2
+
+    # 꺼낸 아이템은 만료 ZSET에서도 제거되어 다시 추가할 수 있다
+    assert queue.get() == "a"
+    assert queue.redis_client.zscore(queue.expiry_key, "a") is None
+    assert queue.add("a", ttl=60) is True
+
+
+def test_trim_expired_removes_only_expired_entries(queue):
+    queue.add_many(["a", "b"], ttl=0)
+    time.sleep(0.01)
+    queue.redis_client.zadd(queue.expiry_key, {"c": 2 ** 52})
+
+    assert queue.trim_expired() == 2
+    assert queue.redis_client.zrange(queue.expiry_key, 0, -1) == ["c"]
+
+
+def test_lease_then_ack(queue):
+    queue.add_many(["a", "b", "c"])
+
+    assert queue.lease_many(2, visibility_timeout=60) == ["a", "b"]
+    assert queue.processing_size() == 2
+    # lease 중인 아이템은 SET에 남아 있어 다시 추가되지 않는다
+    assert queue.add("a") is False
+
+    queue.ack("a", "b")
+    assert queue.processing_size() == 0
+    assert queue.redis_client.zcard(queue.lease_key) == 0
+    assert queue.queue_size() == 1
+    # ack 후에는 다시 추가할 수 있다 (TTL 없음)
+    assert queue.add("a") is True
+
+
+def test_nack_requeues_then_dead_letters(queue):
+    queue.add("a")
+    max_attempts = 3
+
+    for _ in range(max_attempts - 1):
+        assert queue.lease_many(1, visibility_timeout=60) == ["a"]
+        assert queue.nack("a", max_attempts) is True
+        assert queue.queue_size() == 1
+
+    assert queue.lease_many(1, visibility_timeout=60) == ["a"]
+    assert queue.nack("a", max_attempts) is False
+    assert queue.queue_size() == 0
+    assert queue.dead_letter_size() == 1
+    assert queue.processing_size() == 0
+    assert queue.redis_client.hget(queue.attempts_key, "a") is None
+    assert queue.set_size() == 0
+
+
+def test_nack_of_expired_lease_does_not_duplicate(queue):
+    queue.add("a")
+    queue.lease_many(1, visibility_timeout=0)
+    time.sleep(0.01)
+    assert queue.reap_expired() == 1
+
+    # reaper가 이미 되돌린 아이템은 nack해도 한 번만 큐에 있다
+    assert queue.nack("a", 5) is True
+    assert queue.queue_size() == 1
+
+
+def test_release_returns_items_to_front_without_attempts(queue):
+    queue.add_many(["a", "b", "c"])
+    assert queue.lease_many(2, visibility_timeout=60) == ["a", "b"]
+
+    assert queue.release("a", "b") == 2
+    assert queue.release("a") == 0
+    assert queue.processing_size() == 0
+    assert queue.redis_client.hlen(queue.attempts_key) == 0
+    # 되돌린 아이템은 아직 남아 있던 아이템보다 먼저 꺼내진다
+    assert queue.lease_many(3, visibility_timeout=60) == ["a", "b", "c"]
+
+
+def test_reap_expired_returns_only_expired_leases(queue):
+    queue.add_many(["a", "b"])
+    queue.lease_many(1, visibility_timeout=0)
+    queue.lease_many(1, visibility_timeout=60)
+    time.sleep(0.01)
+
+    assert queue.reap_expired() == 1
+    assert queue.processing_size() == 1
+    assert queue.lease_many(1, visibility_timeout=60) == ["a"]
+
+
+def test_async_lease_ack_nack_release(queue):
+    queue.add_many(["a", "b", "c"])
+
+    async def scenario():
+        assert await queue.lease_many_async(3, visibility_timeout=60) == ["a", "b", "c"]
+        await queue.ack_async("a")
+        assert await queue.nack_async("b", 5) is True
+        assert await queue.release_async("c") == 1
+
+    asyncio.run(scenario())
+    assert queue.processing_size() == 0
+    assert queue.redis_client.hget(queue.attempts_key, "b") == "1"
+    # release는 앞쪽, nack은 뒤쪽으로 돌아간다
+    assert queue.lease_many(2, visibility_timeout=60) == ["c", "b"]
+
+
+def test_clear(queue):
+    queue.add_many(["a", "b"], ttl=60)
+    queue.lease_many(1, visibility_timeout=60)
+    queue.redis_client.set(f"{queue.legacy_ttl_key_prefix}old", 1)
+
+    queue.clear()
+    assert queue.queue_size() == 0
+    assert queue.set_size() == 0
+    assert queue.processing_size() == 0
+    assert queue.redis_client.exists(f"{queue.legacy_ttl_key_prefix}old") == 0
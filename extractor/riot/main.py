@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from user.frontier import UserFrontier
 from user.queue import UserIdQueue
 
 
@@ -16,6 +17,12 @@ def initialize_user_queue():
         print(f"UserIdQueue에 {queue_size}개의 user_id가 있습니다. (SET: {set_size}개) 큐를 비웁니다.")
         queue.clear()
         print("큐가 비워졌습니다.")
+
+    frontier = UserFrontier()
+    frontier_size = frontier.size()
+    if frontier_size > 0:
+        print(f"UserFrontier에 {frontier_size}개의 user_id가 있습니다. frontier를 비웁니다.")
+        frontier.clear()
     
 
 
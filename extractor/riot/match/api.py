@@ -1,10 +1,306 @@
-import requests
+import time
+import random
+import asyncio
+import logging
 import httpx
 import orjson
-from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
+from typing import List, Dict, Any, Optional, Mapping
+from match.rate_limit import BaseRateLimiter, retry_after_seconds
+from match.client import build_headers, get_async_client, get_sync_client
+from match.latency import get_latency_tracker
+import metrics
+import tracing
 
+logger = logging.getLogger(__name__)
 
-def get_match_ids(user_id: str, api_key: str, start: int = 0, count: int = 100) -> List[str]:
+# method rate limit 구분용 API 메서드 이름
+METHOD_MATCH_IDS = "match-ids"
+METHOD_MATCH_DETAIL = "match-detail"
+METHOD_MATCH_TIMELINE = "match-timeline"
+
+# 칼바람 나락 queue id
+ARAM_QUEUE_ID = 450
+
+# by-puuid API가 한 번에 돌려주는 최대 match_id 개수
+MAX_MATCH_IDS_PER_PAGE = 100
+
+# 재시도 설정 (429: Retry-After, 5xx/네트워크 오류: jitter 지수 백오프)
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+SERVER_ERROR_STATUS_CODES = {500, 502, 503, 504}
+
+# hedged request를 보내려면 현재 윈도우에 남아 있어야 하는 최소 permit 수
+HEDGE_MIN_SPARE_PERMITS = 10
+
+# 다시 시도해도 성공할 수 없는 에러 (404는 None으로 반환)
+PERMANENT_ERROR_STATUS_CODES = {400, 405, 415}
+
+# API 키가 없거나 잘못되었거나 만료된 경우 (match/user 문제가 아니므로 실행 전체를 중단)
+AUTH_ERROR_STATUS_CODES = {401, 403}
+
+
+class RiotApiError(Exception):
+    """Riot API 요청 실패 (retryable이면 나중에 다시 시도할 가치가 있음)"""
+
+    def __init__(self, url: str, status_code: Optional[int] = None):
+        self.url = url
+        self.status_code = status_code
+        self.retryable = status_code not in PERMANENT_ERROR_STATUS_CODES
+        super().__init__(f"Riot API request failed ({status_code}): {url}")
+
+
+class RiotAuthError(RiotApiError):
+    """API 키 인증 실패 (401/403), 키를 바꾸기 전까지 어떤 요청도 성공할 수 없으므로 실행을 중단해야 함"""
+
+
+def _retry_delay(
+    status_code: Optional[int],
+    headers: Mapping[str, str],
+    attempt: int,
+    limiter: Optional[BaseRateLimiter]
+) -> Optional[float]:
+    """
+    실패한 요청의 재시도 대기 시간 계산
+
+    Args:
+        status_code: HTTP 상태 코드 (네트워크 오류면 None)
+        headers: 응답 헤더
+        attempt: 지금까지 시도한 횟수 (0부터)
+        limiter: rate limiter
+
+    Returns:
+        Optional[float]: 대기 시간 (초), 재시도하지 않을 에러면 None
+    """
+    if status_code == 429:
+        # limiter가 있으면 Retry-After 동안 permit을 주지 않으므로 바로 재시도
+        return 0.0 if limiter else retry_after_seconds(headers)
+
+    if status_code is None or status_code in SERVER_ERROR_STATUS_CODES:
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    return None
+
+
+async def _timed_get_async(
+    url: str,
+    method: str,
+    headers: Mapping[str, str],
+    client: httpx.AsyncClient,
+    timeout: float
+) -> httpx.Response:
+    """GET 요청 후 응답 시간 기록 (타임아웃도 기록해 다음 타임아웃 계산에 반영)"""
+    tracker = get_latency_tracker()
+    started = time.monotonic()
+    try:
+        response = await client.get(url=url, headers=headers, timeout=timeout)
+    except httpx.TimeoutException:
+        tracker.record(method, time.monotonic() - started)
+        raise
+    tracker.record(method, time.monotonic() - started)
+    return response
+
+
+async def _has_spare_permit(limiter: BaseRateLimiter, method: str) -> bool:
+    """현재 윈도우에 여유가 있으면 hedged request용 permit을 하나 가져옴"""
+    if await limiter.available_permits_async(0) < HEDGE_MIN_SPARE_PERMITS:
+        return False
+    return await limiter.try_acquire_async(method) <= 0
+
+
+async def _send_async(
+    url: str,
+    method: str,
+    headers: Mapping[str, str],
+    client: httpx.AsyncClient,
+    limiter: Optional[BaseRateLimiter] = None
+) -> httpx.Response:
+    """
+    관측한 응답 시간 기반 타임아웃으로 GET 요청
+
+    hedging이 켜져 있으면 응답이 p95보다 늦을 때 (rate limit 여유가 있는 경우에만)
+    같은 요청을 한 번 더 보내고 먼저 도착한 응답을 사용한다.
+    """
+    tracker = get_latency_tracker()
+    timeout = tracker.timeout(method)
+    hedge_delay = tracker.hedge_delay(method) if limiter else None
+
+    primary = asyncio.ensure_future(_timed_get_async(url, method, headers, client, timeout))
+    if hedge_delay is None or hedge_delay >= timeout:
+        return await primary
+
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done or not await _has_spare_permit(limiter, method):
+        return await primary
+
+    logger.debug(f"{method} request slower than {hedge_delay:.2f}s, sending hedged request: {url}")
+    hedge = asyncio.ensure_future(_timed_get_async(url, method, headers, client, timeout))
+
+    pending = {primary, hedge}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        # 둘 다 실패하면 원래 요청의 에러를 그대로 올림
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _get_json_async(
+    url: str,
+    method: str,
+    headers: Mapping[str, str],
+    client: httpx.AsyncClient,
+    limiter: Optional[BaseRateLimiter] = None
+) -> Optional[Any]:
+    """
+    rate limiter permit을 받아 GET 요청 후 JSON 반환 (429/5xx는 재시도)
+
+    Args:
+        url: 요청 URL
+        method: API 메서드 이름 (rate limit 구분용)
+        headers: 요청 헤더
+        client: httpx.AsyncClient 인스턴스
+        limiter: rate limiter (None이면 제한 없음)
+
+    Returns:
+        Optional[Any]: 응답 JSON, 404면 None
+
+    Raises:
+        RiotAuthError: API 키 인증 실패 (401/403, 재시도하지 않음)
+        RiotApiError: 재시도 후에도 실패했거나 재시도할 수 없는 에러
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            with tracing.span("rate_limit_wait"):
+                await limiter.acquire(method)
+
+        try:
+            with tracing.span(f"riot_api.{method}"):
+                response = await _send_async(url, method, headers, client, limiter)
+        except httpx.TransportError as e:
+            logger.warning(f"{method} request error (attempt {attempt + 1}): {e!r}")
+            metrics.inc("riot_api_errors_total", method=method, error=type(e).__name__)
+            status_code, response_headers = None, {}
+            if attempt == MAX_RETRIES:
+                raise RiotApiError(url) from e
+        else:
+            metrics.inc("riot_api_responses_total", method=method, status=response.status_code)
+            if limiter:
+                await limiter.update_async(method, response.status_code, response.headers)
+
+            if response.status_code == 200:
+                with tracing.span("json_parse"):
+                    return orjson.loads(response.content)
+            if response.status_code == 404:
+                return None
+
+            status_code, response_headers = response.status_code, response.headers
+            logger.warning(f"{method} request failed ({status_code}, attempt {attempt + 1}): {url}")
+
+        if status_code in AUTH_ERROR_STATUS_CODES:
+            raise RiotAuthError(url, status_code)
+
+        delay = _retry_delay(status_code, response_headers, attempt, limiter)
+        if delay is None or attempt == MAX_RETRIES:
+            raise RiotApiError(url, status_code)
+        await asyncio.sleep(delay)
+
+
+def _get_json(
+    url: str,
+    method: str,
+    headers: Mapping[str, str],
+    limiter: Optional[BaseRateLimiter] = None
+) -> Optional[Any]:
+    """
+    _get_json_async의 동기 버전
+
+    Raises:
+        RiotAuthError: API 키 인증 실패 (401/403, 재시도하지 않음)
+        RiotApiError: 재시도 후에도 실패했거나 재시도할 수 없는 에러
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            with tracing.span("rate_limit_wait"):
+                limiter.acquire_sync(method)
+
+        tracker = get_latency_tracker()
+        started = time.monotonic()
+        try:
+            with tracing.span(f"riot_api.{method}"):
+                response = get_sync_client().get(url=url, headers=headers, timeout=tracker.timeout(method))
+        except httpx.TransportError as e:
+            if isinstance(e, httpx.TimeoutException):
+                tracker.record(method, time.monotonic() - started)
+            logger.warning(f"{method} request error (attempt {attempt + 1}): {e!r}")
+            metrics.inc("riot_api_errors_total", method=method, error=type(e).__name__)
+            status_code, response_headers = None, {}
+            if attempt == MAX_RETRIES:
+                raise RiotApiError(url) from e
+        else:
+            tracker.record(method, time.monotonic() - started)
+
+            metrics.inc("riot_api_responses_total", method=method, status=response.status_code)
+            if limiter:
+                limiter.update(method, response.status_code, response.headers)
+
+            if response.status_code == 200:
+                with tracing.span("json_parse"):
+                    return orjson.loads(response.content)
+            if response.status_code == 404:
+                return None
+
+            status_code, response_headers = response.status_code, response.headers
+            logger.warning(f"{method} request failed ({status_code}, attempt {attempt + 1}): {url}")
+
+        if status_code in AUTH_ERROR_STATUS_CODES:
+            raise RiotAuthError(url, status_code)
+
+        delay = _retry_delay(status_code, response_headers, attempt, limiter)
+        if delay is None or attempt == MAX_RETRIES:
+            raise RiotApiError(url, status_code)
+        time.sleep(delay)
+
+
+def _match_ids_url(
+    user_id: str,
+    start: int,
+    count: int,
+    queue: Optional[int] = None,
+    match_type: Optional[str] = None,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None
+) -> str:
+    """by-puuid match_id 목록 URL 생성 (None인 필터는 제외)"""
+    base_url = f"https://asia.api.riotgames.com/lol/match/v5/matches/by-puuid/{user_id}/ids"
+    params = {
+        "startTime": start_time,
+        "endTime": end_time,
+        "queue": queue,
+        "type": match_type,
+        "start": start,
+        "count": count,
+    }
+    return f"{base_url}?{urlencode({key: value for key, value in params.items() if value is not None})}"
+
+
+def get_match_ids(
+    user_id: str,
+    api_key: str,
+    start: int = 0,
+    count: int = 100,
+    limiter: Optional[BaseRateLimiter] = None,
+    queue: Optional[int] = None,
+    match_type: Optional[str] = None,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None
+) -> List[str]:
     """
     user_id(puuid)로 match_id 리스트 가져오기
     2000 requests every 10 seconds
@@ -14,26 +310,78 @@ def get_match_ids(user_id: str, api_key: str, start: int = 0, count: int = 100)
         api_key: Riot API 키
         start: 시작 인덱스 (기본값: 0)
         count: 가져올 개수 (기본값: 100)
+        limiter: rate limiter (None이면 제한 없음)
+        queue: queue id 필터 (예: ARAM_QUEUE_ID)
+        match_type: match type 필터 (ranked, normal, tourney, tutorial)
+        start_time: 이 시각(epoch 초) 이후 match만
+        end_time: 이 시각(epoch 초) 이전 match만
         
     Returns:
         List[str]: match_id 리스트
+
+    Raises:
+        RiotApiError: 요청 실패 (재시도 후)
     """
-    base_url = f"https://asia.api.riotgames.com/lol/match/v5/matches/by-puuid/{user_id}/ids"
-    url = f"{base_url}?start={start}&count={count}"
+    url = _match_ids_url(user_id, start, count, queue, match_type, start_time, end_time)
+
+    return _get_json(url, METHOD_MATCH_IDS, build_headers(api_key), limiter) or []
+
+
+async def get_match_ids_async(
+    user_id: str,
+    api_key: str,
+    client: Optional[httpx.AsyncClient] = None,
+    limiter: Optional[BaseRateLimiter] = None,
+    queue: Optional[int] = None,
+    match_type: Optional[str] = None,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    max_pages: int = 1
+) -> List[str]:
+    """
+    user_id(puuid)로 match_id 리스트를 비동기로 가져오기 (페이지 자동 조회)
     
-    headers = {
-        "X-Riot-Token": api_key,
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
-        "Origin": "https://developer.riotgames.com"
-    }
+    Args:
+        user_id: Riot API puuid
+        api_key: Riot API 키
+        client: httpx.AsyncClient 인스턴스 (None이면 공유 클라이언트 사용)
+        limiter: rate limiter (None이면 제한 없음)
+        queue: queue id 필터 (예: ARAM_QUEUE_ID)
+        match_type: match type 필터 (ranked, normal, tourney, tutorial)
+        start_time: 이 시각(epoch 초) 이후 match만
+        end_time: 이 시각(epoch 초) 이전 match만
+        max_pages: 최대 조회 페이지 수 (페이지당 MAX_MATCH_IDS_PER_PAGE개)
+        
+    Returns:
+        List[str]: match_id 리스트 (최신순)
+
+    Raises:
+        RiotApiError: 요청 실패 (재시도 후)
+    """
+    headers = build_headers(api_key)
+    client = client or get_async_client()
 
-    response = requests.get(url=url, headers=headers)
-    return orjson.loads(response.content)
+    match_ids = []
+    for page in range(max_pages):
+        url = _match_ids_url(
+            user_id, page * MAX_MATCH_IDS_PER_PAGE, MAX_MATCH_IDS_PER_PAGE,
+            queue, match_type, start_time, end_time
+        )
+        page_ids = await _get_json_async(url, METHOD_MATCH_IDS, headers, client, limiter) or []
+        match_ids.extend(page_ids)
 
+        # 마지막 페이지면 종료
+        if len(page_ids) < MAX_MATCH_IDS_PER_PAGE:
+            break
 
-def get_match_detail(match_id: str, api_key: str) -> Optional[Dict[str, Any]]:
+    return match_ids
+
+
+def get_match_detail(
+    match_id: str,
+    api_key: str,
+    limiter: Optional[BaseRateLimiter] = None
+) -> Optional[Dict[str, Any]]:
     """
     match_id로 전적 상세 정보 가져오기
     2000 requests every 10 seconds
@@ -41,56 +389,51 @@ def get_match_detail(match_id: str, api_key: str) -> Optional[Dict[str, Any]]:
     Args:
         match_id: Riot API match_id
         api_key: Riot API 키
+        limiter: rate limiter (None이면 제한 없음)
         
     Returns:
-        Optional[Dict[str, Any]]: 전적 상세 정보, 에러 시 None
+        Optional[Dict[str, Any]]: 전적 상세 정보, 존재하지 않는 match(404)면 None
+
+    Raises:
+        RiotApiError: 요청 실패 (retryable이면 나중에 다시 시도)
     """
     url = f"https://asia.api.riotgames.com/lol/match/v5/matches/{match_id}"
-    
-    headers = {
-        "X-Riot-Token": api_key,
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
-        "Origin": "https://developer.riotgames.com"
-    }
-    
-    response = requests.get(url=url, headers=headers)
-    return orjson.loads(response.content)
 
+    return _get_json(url, METHOD_MATCH_DETAIL, build_headers(api_key), limiter)
 
-async def get_match_detail_async(match_id: str, api_key: str, client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+
+async def get_match_detail_async(
+    match_id: str,
+    api_key: str,
+    client: Optional[httpx.AsyncClient] = None,
+    limiter: Optional[BaseRateLimiter] = None
+) -> Optional[Dict[str, Any]]:
     """
     match_id로 전적 상세 정보를 비동기로 가져오기
     
     Args:
         match_id: Riot API match_id
         api_key: Riot API 키
-        client: httpx.AsyncClient 인스턴스
+        client: httpx.AsyncClient 인스턴스 (None이면 공유 클라이언트 사용)
+        limiter: rate limiter (None이면 제한 없음)
         
     Returns:
-        Optional[Dict[str, Any]]: 전적 상세 정보, 에러 시 None
+        Optional[Dict[str, Any]]: 전적 상세 정보, 존재하지 않는 match(404)면 None
+
+    Raises:
+        RiotApiError: 요청 실패 (retryable이면 나중에 다시 시도)
     """
     url = f"https://asia.api.riotgames.com/lol/match/v5/matches/{match_id}"
-    
-    headers = {
-        "X-Riot-Token": api_key,
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
-        "Origin": "https://developer.riotgames.com"
-    }
-    
-    try:
-        response = await client.get(url=url, headers=headers)
-        return orjson.loads(response.content)
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return None
+
+    return await _get_json_async(url, METHOD_MATCH_DETAIL, build_headers(api_key), client or get_async_client(), limiter)
 
 
-async def get_match_timeline_async(match_id: str, api_key: str, client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+async def get_match_timeline_async(
+    match_id: str,
+    api_key: str,
+    client: Optional[httpx.AsyncClient] = None,
+    limiter: Optional[BaseRateLimiter] = None
+) -> Optional[Dict[str, Any]]:
     """
     match_id로 match timeline 정보를 비동기로 가져오기
     2000 requests every 10 seconds
@@ -98,26 +441,16 @@ async def get_match_timeline_async(match_id: str, api_key: str, client: httpx.As
     Args:
         match_id: Riot API match_id
         api_key: Riot API 키
-        client: httpx.AsyncClient 인스턴스
+        client: httpx.AsyncClient 인스턴스 (None이면 공유 클라이언트 사용)
+        limiter: rate limiter (None이면 제한 없음)
         
     Returns:
-        Optional[Dict[str, Any]]: match timeline 정보, 에러 시 None
+        Optional[Dict[str, Any]]: match timeline 정보, 존재하지 않는 match(404)면 None
+
+    Raises:
+        RiotApiError: 요청 실패 (retryable이면 나중에 다시 시도)
     """
     url = f"https://asia.api.riotgames.com/lol/match/v5/matches/{match_id}/timeline"
-    
-    headers = {
-        "X-Riot-Token": api_key,
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
-        "Origin": "https://developer.riotgames.com"
-    }
-    
-    try:
-        response = await client.get(url=url, headers=headers)
-        return orjson.loads(response.content)
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return None
+
+    return await _get_json_async(url, METHOD_MATCH_TIMELINE, build_headers(api_key), client or get_async_client(), limiter)
 
@@ -0,0 +1,137 @@
+import os
+import asyncio
+import importlib.util
+from functools import lru_cache
+from typing import Any, Coroutine, Dict, Optional
+import httpx
+
+# HTTP/2 사용 여부 (h2 패키지가 설치된 경우에만 사용)
+HTTP2_ENABLED = os.getenv("RIOT_HTTP2", "true").lower() == "true" and importlib.util.find_spec("h2") is not None
+
+# 커넥션 풀 설정
+MAX_CONNECTIONS = int(os.getenv("RIOT_MAX_CONNECTIONS", 100))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("RIOT_MAX_KEEPALIVE_CONNECTIONS", 50))
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# 요청 타임아웃 (초)
+REQUEST_TIMEOUT_SECONDS = 30.0
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+
+
+@lru_cache(maxsize=None)
+def build_headers(api_key: str) -> Dict[str, str]:
+    """
+    Riot API 요청 헤더 (API 키별로 한 번만 생성, 수정하지 말 것)
+
+    Args:
+        api_key: Riot API 키
+
+    Returns:
+        Dict[str, str]: 요청 헤더
+    """
+    return {
+        "X-Riot-Token": api_key,
+        "User-Agent": USER_AGENT,
+        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+        "Accept-Charset": "application/x-www-form-urlencoded; charset=UTF-8",
+        "Origin": "https://developer.riotgames.com"
+    }
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+    )
+
+
+# 전역 인스턴스 (worker 프로세스 단위로 커넥션 유지)
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_client: Optional[httpx.Client] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    worker 프로세스 전용 이벤트 루프 반환
+
+    asyncio.run은 실행할 때마다 루프를 새로 만들고 닫기 때문에
+    AsyncClient의 커넥션을 다음 실행에서 재사용할 수 없다.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    코루틴을 worker 프로세스 전용 이벤트 루프에서 실행 (asyncio.run 대체)
+
+    Args:
+        coro: 실행할 코루틴
+
+    Returns:
+        Any: 코루틴 반환값
+    """
+    loop = get_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        _cancel_pending_tasks(loop)
+
+
+def _cancel_pending_tasks(loop: asyncio.AbstractEventLoop):
+    """
+    실행이 끝난 뒤 남은 task를 취소하고 끝날 때까지 기다림 (asyncio.run과 같은 정리)
+
+    루프를 계속 재사용하므로, 정리하지 않으면 실패한 실행의 task가 다음 run() 안에서 이어서 실행된다.
+    """
+    pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    if not pending:
+        return
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """공유 httpx.AsyncClient 싱글톤 인스턴스 반환 (run()으로 실행한 코루틴 안에서 사용)"""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            limits=_limits(),
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+    return _async_client
+
+
+def get_sync_client() -> httpx.Client:
+    """공유 httpx.Client 싱글톤 인스턴스 반환"""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            http2=HTTP2_ENABLED,
+            limits=_limits(),
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+    return _sync_client
+
+
+def close():
+    """공유 클라이언트와 이벤트 루프 종료"""
+    global _event_loop, _async_client, _sync_client
+
+    if _async_client is not None and not _async_client.is_closed:
+        run(_async_client.aclose())
+    if _sync_client is not None:
+        _sync_client.close()
+    if _event_loop is not None and not _event_loop.is_closed():
+        _event_loop.close()
+
+    _event_loop = None
+    _async_client = None
+    _sync_client = None
@@ -0,0 +1,108 @@
+import os
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# 메서드별로 보관할 최근 응답 시간 개수
+LATENCY_WINDOW_SIZE = 500
+
+# 분위수를 계산하기 위한 최소 표본 수 (그 전에는 기본 타임아웃 사용)
+MIN_LATENCY_SAMPLES = 50
+
+# 타임아웃 = p99 * 배수 (최소/최대 범위 안에서)
+TIMEOUT_MULTIPLIER = 2.0
+MIN_TIMEOUT_SECONDS = 2.0
+MAX_TIMEOUT_SECONDS = 30.0
+
+# hedged request 사용 여부와 기준 분위수 (이 시간이 지나도 응답이 없으면 같은 요청을 한 번 더 보냄)
+HEDGE_REQUESTS = os.getenv("RIOT_HEDGE_REQUESTS", "false").lower() == "true"
+HEDGE_QUANTILE = 0.95
+
+
+class LatencyTracker:
+    """API 메서드(detail, timeline, ids)별 최근 응답 시간 기록"""
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE):
+        """
+        Args:
+            window_size: 메서드별로 보관할 최근 응답 시간 개수
+        """
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, method: str, seconds: float):
+        """
+        응답 시간 기록
+
+        Args:
+            method: API 메서드 이름
+            seconds: 응답 시간 (초)
+        """
+        with self._lock:
+            samples = self._samples.get(method)
+            if samples is None:
+                samples = self._samples[method] = deque(maxlen=self.window_size)
+            samples.append(seconds)
+
+    def quantile(self, method: str, q: float) -> Optional[float]:
+        """
+        응답 시간 분위수
+
+        Args:
+            method: API 메서드 이름
+            q: 분위수 (0~1)
+
+        Returns:
+            Optional[float]: 응답 시간 (초), 표본이 부족하면 None
+        """
+        with self._lock:
+            samples = self._samples.get(method)
+            if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(samples)
+
+        index = min(math.ceil(q * len(ordered)) - 1, len(ordered) - 1)
+        return ordered[max(index, 0)]
+
+    def timeout(self, method: str) -> float:
+        """
+        관측한 p99 기반 요청 타임아웃
+
+        Args:
+            method: API 메서드 이름
+
+        Returns:
+            float: 타임아웃 (초), 표본이 부족하면 MAX_TIMEOUT_SECONDS
+        """
+        p99 = self.quantile(method, 0.99)
+        if p99 is None:
+            return MAX_TIMEOUT_SECONDS
+        return min(max(p99 * TIMEOUT_MULTIPLIER, MIN_TIMEOUT_SECONDS), MAX_TIMEOUT_SECONDS)
+
+    def hedge_delay(self, method: str) -> Optional[float]:
+        """
+        hedged request를 보내기까지 기다릴 시간
+
+        Args:
+            method: API 메서드 이름
+
+        Returns:
+            Optional[float]: 대기 시간 (초), hedging을 사용하지 않거나 표본이 부족하면 None
+        """
+        if not HEDGE_REQUESTS:
+            return None
+        return self.quantile(method, HEDGE_QUANTILE)
+
+
+# 전역 인스턴스 (worker 프로세스 단위로 응답 시간 유지)
+_latency_tracker: Optional[LatencyTracker] = None
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """LatencyTracker 싱글톤 인스턴스 반환"""
+    global _latency_tracker
+    if _latency_tracker is None:
+        _latency_tracker = LatencyTracker()
+    return _latency_tracker
@@ -0,0 +1,135 @@
+from typing import List, Optional, Tuple
+import redis
+import redis.asyncio
+
+# shard 하나가 담당하는 match 번호 범위 (2^24 bit = 2MB)
+SHARD_BITS = 24
+SHARD_MASK = (1 << SHARD_BITS) - 1
+
+
+def parse_match_id(match_id: str) -> Optional[Tuple[str, int]]:
+    """
+    match_id를 플랫폼 prefix와 숫자로 분리
+
+    Args:
+        match_id: Riot API match_id (예: KR_7234567890)
+
+    Returns:
+        Optional[Tuple[str, int]]: (플랫폼 prefix, match 번호), 형식이 다르면 None
+    """
+    platform, _, number = match_id.rpartition("_")
+    if not platform or not number.isdigit():
+        return None
+    return platform, int(number)
+
+
+class ProcessedMatchIndex:
+    """
+    처리가 끝난 match_id 영구 인덱스 (플랫폼별로 샤딩한 Redis bitmap)
+
+    match 번호의 상위 비트로 shard 키(processed_match:<플랫폼>:<shard>)를 고르고,
+    하위 SHARD_BITS 비트를 offset으로 사용해 match당 1bit만 사용한다.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        key_prefix: str = "processed_match",
+        async_redis_client: Optional[redis.asyncio.Redis] = None
+    ):
+        """
+        Args:
+            redis_client: Redis 클라이언트
+            key_prefix: Redis 키 prefix
+            async_redis_client: 비동기 Redis 클라이언트 (None이면 비동기 경로도 동기 클라이언트 사용)
+        """
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.async_redis_client = async_redis_client
+
+    def _locate(self, match_id: str) -> Optional[Tuple[str, int]]:
+        parsed = parse_match_id(match_id)
+        if parsed is None:
+            return None
+        platform, number = parsed
+        return f"{self.key_prefix}:{platform}:{number >> SHARD_BITS}", number & SHARD_MASK
+
+    def locate_many(self, match_ids: List[str]) -> List[Optional[Tuple[str, int]]]:
+        """
+        match_id별 bitmap 위치 (Lua 스크립트에서 GETBIT/SETBIT 할 때 사용)
+
+        Args:
+            match_ids: match_id 리스트
+
+        Returns:
+            List[Optional[Tuple[str, int]]]: (shard 키, bit offset), 형식이 다른 match_id는 None
+        """
+        return [self._locate(match_id) for match_id in match_ids]
+
+    def contains_many(self, match_ids: List[str]) -> List[bool]:
+        """
+        match_id별 처리 여부 조회 (한 번의 pipeline)
+
+        Args:
+            match_ids: 조회할 match_id 리스트
+
+        Returns:
+            List[bool]: match_id별 처리 여부 (형식이 다른 match_id는 False)
+        """
+        locations = [self._locate(match_id) for match_id in match_ids]
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for location in locations:
+            if location:
+                pipe.getbit(*location)
+        bits = iter(pipe.execute())
+
+        return [bool(next(bits)) if location else False for location in locations]
+
+    def contains(self, match_id: str) -> bool:
+        """
+        match_id 처리 여부 조회
+
+        Args:
+            match_id: 조회할 match_id
+
+        Returns:
+            bool: 처리가 끝났으면 True
+        """
+        return self.contains_many([match_id])[0]
+
+    def mark_many(self, match_ids: List[str]):
+        """
+        match_id들을 처리 완료로 기록
+
+        Args:
+            match_ids: 처리가 끝난 match_id 리스트
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._queue_marks(pipe, match_ids)
+        pipe.execute()
+
+    async def mark_many_async(self, match_ids: List[str]):
+        """mark_many의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        if self.async_redis_client is None:
+            return self.mark_many(match_ids)
+
+        pipe = self.async_redis_client.pipeline(transaction=False)
+        self._queue_marks(pipe, match_ids)
+        await pipe.execute()
+
+    def _queue_marks(self, pipe, match_ids: List[str]):
+        """match_id별 SETBIT을 pipeline에 추가 (형식이 다른 match_id는 제외)"""
+        for match_id in match_ids:
+            location = self._locate(match_id)
+            if location:
+                pipe.setbit(*location, 1)
+
+    def mark(self, match_id: str):
+        """
+        match_id를 처리 완료로 기록
+
+        Args:
+            match_id: 처리가 끝난 match_id
+        """
+        self.mark_many([match_id])
@@ -1,15 +1,44 @@
-from typing import Optional
+import os
+from typing import List, Optional
 from db.redis import BaseRedisQueue
+from match.processed import ProcessedMatchIndex
+
+# match_id 최대 시도 횟수 (초과하면 dead-letter 큐로 이동)
+MAX_MATCH_ATTEMPTS = 5
+
+# match_id lease 유지 시간 (초), 이 시간 안에 ack 되지 않으면 다시 큐로 돌아간다
+MATCH_LEASE_TIMEOUT_SECONDS = int(os.getenv("MATCH_LEASE_TIMEOUT_SECONDS", 600))
+
+# 처리 완료 bit가 없는 match_id만 추가 (bit 확인과 추가를 원자적으로 실행해 ack와 경합하지 않음)
+# KEYS: [SET 키, LIST 키, match_id별 bitmap shard 키...]
+# ARGV: [match_id, bit offset(형식이 다른 match_id는 -1), ...]
+ADD_UNPROCESSED_SCRIPT = """
+local added = {}
+for i = 1, #ARGV / 2 do
+    local item = ARGV[i * 2 - 1]
+    local offset = tonumber(ARGV[i * 2])
+    added[i] = 0
+    if offset < 0 or redis.call('GETBIT', KEYS[i + 2], offset) == 0 then
+        if redis.call('SADD', KEYS[1], item) == 1 then
+            redis.call('LPUSH', KEYS[2], item)
+            added[i] = 1
+        end
+    end
+end
+return added
+"""
 
 
 class MatchIdQueue(BaseRedisQueue):
-    """Match ID 전용 Redis 큐 (중복 제거)"""
+    """Match ID 전용 Redis 큐 (중복 제거, 처리가 끝난 match_id는 다시 추가하지 않음)"""
 
     def __init__(self):
         super().__init__(
             queue_key="match_id_queue",
             set_key="match_id_set"
         )
+        self.processed_index = ProcessedMatchIndex(self.redis_client, async_redis_client=self.async_redis_client)
+        self._add_unprocessed_script = self.redis_client.register_script(ADD_UNPROCESSED_SCRIPT)
 
     def add_match_id(self, match_id: str) -> bool:
         """
@@ -19,10 +48,32 @@ class MatchIdQueue(BaseRedisQueue):
             match_id: 추가할 match_id
 
         Returns:
-            bool: 추가 성공 여부 (이미 존재하면 False)
+            bool: 추가 성공 여부 (이미 존재하거나 처리가 끝났으면 False)
+        """
+        return self.add_match_ids([match_id])[0]
+
+    def add_match_ids(self, match_ids: List[str]) -> List[bool]:
         """
-        # match_id는 영구 중복 제거 (TTL 없음)
-        return self.add(match_id)
+        여러 match_id를 한 번에 큐에 추가 (중복 제거)
+
+        Args:
+            match_ids: 추가할 match_id 리스트
+
+        Returns:
+            List[bool]: match_id별 추가 성공 여부 (이미 존재하거나 처리가 끝났으면 False)
+        """
+        if not match_ids:
+            return []
+
+        # 이미 처리한 match_id는 제외하고 추가 (match_id는 영구 중복 제거, TTL 없음)
+        keys, args = [self.set_key, self.queue_key], []
+        for match_id, location in zip(match_ids, self.processed_index.locate_many(match_ids)):
+            shard_key, offset = location or (self.set_key, -1)
+            keys.append(shard_key)
+            args.extend([match_id, offset])
+
+        added = self._add_unprocessed_script(keys=keys, args=args)
+        return [bool(flag) for flag in added]
 
     def get_match_id(self) -> Optional[str]:
         """
@@ -31,4 +82,117 @@ class MatchIdQueue(BaseRedisQueue):
         Returns:
             Optional[str]: 가져온 match_id, 큐가 비어있으면 None
         """
-        return self.get()
\ No newline at end of file
+        return self.get()
+
+    def pop_match_ids(self, count: int) -> List[str]:
+        """
+        큐에서 여러 match_id를 한 번에 가져옴 (FIFO)
+
+        Args:
+            count: 가져올 최대 개수
+
+        Returns:
+            List[str]: 가져온 match_id 리스트
+        """
+        return self.pop_many(count)
+
+    def lease_match_ids(self, count: int) -> List[str]:
+        """
+        큐에서 여러 match_id를 lease로 가져옴 (ack 전까지 processing LIST에 보관)
+
+        Args:
+            count: 가져올 최대 개수
+
+        Returns:
+            List[str]: 가져온 match_id 리스트
+        """
+        return self.lease_many(count, MATCH_LEASE_TIMEOUT_SECONDS)
+
+    def ack_match_id(self, match_id: str):
+        """
+        처리가 끝난 match_id의 lease 해제 후 처리 완료 인덱스에 기록
+
+        Args:
+            match_id: 처리가 끝난 match_id (저장 성공, ARAM 아님, 404 등)
+        """
+        # 중복 제거 SET에서 빠지기 전에 처리 완료 인덱스에 먼저 기록 (add_match_ids가 둘 중 하나는 항상 보도록)
+        self.processed_index.mark(match_id)
+        self.ack(match_id)
+
+    def ack_match_ids(self, match_ids: List[str]):
+        """
+        처리가 끝난 여러 match_id를 한 번에 완료 처리
+
+        Args:
+            match_ids: 처리가 끝난 match_id 리스트
+        """
+        if match_ids:
+            self.processed_index.mark_many(match_ids)
+            self.ack(*match_ids)
+
+    def nack_match_id(self, match_id: str) -> bool:
+        """
+        일시적인 에러로 처리하지 못한 match_id를 다시 큐에 추가
+
+        Args:
+            match_id: 다시 추가할 match_id
+
+        Returns:
+            bool: 재시도 큐에 추가되면 True, 시도 횟수 초과로 dead-letter 큐로 이동하면 False
+        """
+        return self.nack(match_id, MAX_MATCH_ATTEMPTS)
+
+    def release_match_ids(self, match_ids: List[str]) -> int:
+        """
+        lease로 가져왔지만 처리하지 않은 match_id를 큐 앞쪽으로 되돌림
+
+        Args:
+            match_ids: 되돌릴 match_id 리스트
+
+        Returns:
+            int: 되돌린 match_id 개수
+        """
+        return self.release(*match_ids)
+
+    async def lease_match_ids_async(self, count: int) -> List[str]:
+        """lease_match_ids의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        return await self.lease_many_async(count, MATCH_LEASE_TIMEOUT_SECONDS)
+
+    async def ack_match_id_async(self, match_id: str):
+        """ack_match_id의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        await self.ack_match_ids_async([match_id])
+
+    async def ack_match_ids_async(self, match_ids: List[str]):
+        """ack_match_ids의 비동기 버전 (처리 완료 인덱스에 먼저 기록한 뒤 ack)"""
+        if match_ids:
+            await self.processed_index.mark_many_async(match_ids)
+            await self.ack_async(*match_ids)
+
+    async def nack_match_id_async(self, match_id: str) -> bool:
+        """nack_match_id의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        return await self.nack_async(match_id, MAX_MATCH_ATTEMPTS)
+
+    async def release_match_ids_async(self, match_ids: List[str]) -> int:
+        """release_match_ids의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        return await self.release_async(*match_ids)
+
+    def is_processed(self, match_id: str) -> bool:
+        """
+        처리가 끝난 match_id인지 확인
+
+        Args:
+            match_id: 확인할 match_id
+
+        Returns:
+            bool: 처리가 끝났으면 True
+        """
+        return self.processed_index.contains(match_id)
+
+    def reap_expired_match_ids(self) -> int:
+        """
+        lease가 만료된 match_id를 큐로 되돌림 (처리 중 worker가 죽은 경우)
+
+        Returns:
+            int: 되돌린 match_id 개수
+        """
+        return self.reap_expired()
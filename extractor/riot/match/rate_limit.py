@@ -0,0 +1,657 @@
+import os
+import time
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple, Mapping
+import redis
+import redis.asyncio
+
+# 응답 헤더를 받기 전까지 사용할 기본 app rate limit (개발용 키 기준)
+DEFAULT_APP_RATE_LIMIT = os.getenv("RIOT_APP_RATE_LIMIT", "20:1,100:120")
+
+# 서버와 로컬의 윈도우 시작 시점 차이를 보정하기 위한 여유 시간 (초)
+WINDOW_MARGIN_SECONDS = 0.25
+
+# Retry-After 헤더 없이 429를 받았을 때 대기할 시간 (초)
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+# rate limiter 백엔드 (redis: 모든 worker가 한도 공유, local: 프로세스 단위)
+RATE_LIMIT_BACKEND = os.getenv("RIOT_RATE_LIMIT_BACKEND", "redis")
+
+# Redis rate limit 키 prefix
+RATE_LIMIT_KEY_PREFIX = "rate_limit"
+
+# Redis에 저장된 한도 정보를 다시 읽어오는 주기 (초)
+LIMITS_CACHE_SECONDS = 5.0
+
+# 헤더로 학습한 한도 정보 보관 기간 (초)
+LIMITS_TTL_SECONDS = 24 * 60 * 60
+
+# 모든 윈도우에 여유가 있을 때만 카운트를 올린다 (원자적 실행)
+# KEYS: [app 차단 키, method 차단 키, 윈도우 카운터 키...]
+# ARGV: [윈도우별 한도, 윈도우 길이(ms) ...]
+ACQUIRE_SCRIPT = """
+local wait = 0
+for i = 1, 2 do
+    local ttl = redis.call('PTTL', KEYS[i])
+    if ttl > wait then wait = ttl end
+end
+if wait > 0 then return wait end
+
+for i = 3, #KEYS do
+    local limit = tonumber(ARGV[(i - 3) * 2 + 1])
+    local count = tonumber(redis.call('GET', KEYS[i]) or '0')
+    if count >= limit then
+        local ttl = redis.call('PTTL', KEYS[i])
+        if ttl < 0 then
+            ttl = tonumber(ARGV[(i - 3) * 2 + 2])
+            redis.call('PEXPIRE', KEYS[i], ttl)
+        end
+        if ttl > wait then wait = ttl end
+    end
+end
+if wait > 0 then return wait end
+
+for i = 3, #KEYS do
+    if redis.call('INCR', KEYS[i]) == 1 then
+        redis.call('PEXPIRE', KEYS[i], ARGV[(i - 3) * 2 + 2])
+    end
+end
+return 0
+"""
+
+# 서버가 알려준 카운트가 더 크면 카운터 보정 (남은 TTL 유지)
+# KEYS: [윈도우 카운터 키...]
+# ARGV: [윈도우별 카운트, 윈도우 길이(ms) ...]
+SYNC_SCRIPT = """
+for i = 1, #KEYS do
+    local count = tonumber(ARGV[i * 2 - 1])
+    local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+    if count > current then
+        local ttl = redis.call('PTTL', KEYS[i])
+        if ttl <= 0 then ttl = tonumber(ARGV[i * 2]) end
+        redis.call('SET', KEYS[i], count, 'PX', ttl)
+    end
+end
+return 0
+"""
+
+
+def parse_rate_limit_header(value: Optional[str]) -> List[Tuple[int, int]]:
+    """
+    Riot rate limit 헤더 파싱
+
+    Args:
+        value: "20:1,100:120" 형식의 헤더 값 (요청 수:윈도우 초)
+
+    Returns:
+        List[Tuple[int, int]]: (요청 수, 윈도우 초) 리스트 (형식이 잘못된 항목은 건너뜀)
+    """
+    if not value:
+        return []
+
+    pairs = []
+    for part in value.split(","):
+        count, _, seconds = part.strip().partition(":")
+        try:
+            pair = (int(count), int(seconds))
+        except ValueError:
+            continue
+        if pair[0] >= 0 and pair[1] > 0:
+            pairs.append(pair)
+    return pairs
+
+
+def window_budget(limit: int, seconds: int, count: int, until_reset: Optional[float], horizon: float) -> int:
+    """
+    horizon초 동안 하나의 윈도우에서 사용할 수 있는 요청 수
+
+    Args:
+        limit: 윈도우 한도
+        seconds: 윈도우 길이 (초)
+        count: 현재 윈도우 사용량
+        until_reset: 윈도우 리셋까지 남은 시간 (초), 시작 전이면 None
+        horizon: 계산 기간 (초)
+
+    Returns:
+        int: 사용할 수 있는 요청 수
+    """
+    remaining = limit - count
+    # horizon 안에 윈도우가 리셋되는 횟수만큼 한도가 추가된다
+    if until_reset is None:
+        until_reset = seconds
+    if until_reset < horizon:
+        resets = 1 + int((horizon - until_reset) // seconds)
+        remaining += limit * resets
+    return remaining
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> float:
+    """429 응답의 Retry-After 값 (초), 없거나 숫자가 아니면 DEFAULT_RETRY_AFTER_SECONDS"""
+    try:
+        retry_after = float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+    return retry_after if retry_after >= 0 else DEFAULT_RETRY_AFTER_SECONDS
+
+
+class RateLimitWindow:
+    """하나의 rate limit 윈도우 (예: 120초당 100개)"""
+
+    def __init__(self, limit: int, seconds: int):
+        self.limit = limit
+        self.seconds = seconds
+        self.count = 0
+        self.reset_at = 0.0
+
+    def refresh(self, now: float):
+        """윈도우가 끝났으면 카운트 초기화"""
+        if self.reset_at and now >= self.reset_at:
+            self.count = 0
+            self.reset_at = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """permit을 얻기 위해 기다려야 하는 시간 (초)"""
+        if self.count < self.limit:
+            return 0.0
+        return max(self.reset_at - now, 0.0)
+
+    def consume(self, now: float):
+        """permit 1개 사용 (윈도우는 첫 요청 시점부터 시작)"""
+        if self.count == 0 or not self.reset_at:
+            self.reset_at = now + self.seconds + WINDOW_MARGIN_SECONDS
+        self.count += 1
+
+    def sync(self, count: int, now: float):
+        """서버가 알려준 카운트로 로컬 카운트 보정 (더 큰 값 사용)"""
+        if count > self.count:
+            if not self.reset_at:
+                self.reset_at = now + self.seconds + WINDOW_MARGIN_SECONDS
+            self.count = count
+
+
+class BaseRateLimiter(ABC):
+    """rate limiter 공통 인터페이스 (permit 획득 대기 로직)"""
+
+    @abstractmethod
+    def try_acquire(self, method: str) -> float:
+        """
+        permit 획득 시도 (대기하지 않음)
+
+        Args:
+            method: API 메서드 이름 (method rate limit 구분용)
+
+        Returns:
+            float: 0이면 획득 성공, 양수면 다시 시도하기까지 기다려야 하는 시간 (초)
+        """
+
+    @abstractmethod
+    def available_permits(self, horizon: float) -> int:
+        """
+        앞으로 horizon초 동안 사용할 수 있는 app permit 수 (가장 빡빡한 윈도우 기준)
+
+        Args:
+            horizon: 계산 기간 (초), 보통 task 실행 주기
+
+        Returns:
+            int: 기간 내 사용할 수 있는 최대 요청 수
+        """
+
+    @abstractmethod
+    def reset_delay(self) -> float:
+        """
+        app permit을 다시 받을 수 있을 때까지 남은 시간 (한도가 찬 윈도우가 초기화되거나 429 차단이 풀릴 때까지)
+
+        Returns:
+            float: 대기 시간 (초), 지금 바로 받을 수 있으면 0
+        """
+
+    @abstractmethod
+    def window_usage(self, methods: Iterable[str] = ()) -> List[Tuple[str, int, int, int]]:
+        """
+        윈도우별 현재 사용량 (metrics 용)
+
+        Args:
+            methods: app 윈도우와 함께 조회할 API 메서드 이름
+
+        Returns:
+            List[Tuple[str, int, int, int]]: [(scope, 윈도우 초, 사용한 요청 수, 한도), ...]
+        """
+
+    @abstractmethod
+    def update(self, method: str, status_code: int, headers: Mapping[str, str]):
+        """
+        응답 헤더로 한도/사용량 갱신
+
+        Args:
+            method: API 메서드 이름
+            status_code: HTTP 상태 코드
+            headers: 응답 헤더
+        """
+
+    async def try_acquire_async(self, method: str) -> float:
+        """try_acquire의 비동기 버전 (기본 구현은 try_acquire를 그대로 호출)"""
+        return self.try_acquire(method)
+
+    async def update_async(self, method: str, status_code: int, headers: Mapping[str, str]):
+        """update의 비동기 버전 (기본 구현은 update를 그대로 호출)"""
+        self.update(method, status_code, headers)
+
+    async def available_permits_async(self, horizon: float) -> int:
+        """available_permits의 비동기 버전 (기본 구현은 available_permits를 그대로 호출)"""
+        return self.available_permits(horizon)
+
+    async def acquire(self, method: str):
+        """permit을 얻을 때까지 비동기로 대기"""
+        while True:
+            wait = await self.try_acquire_async(method)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, method: str):
+        """permit을 얻을 때까지 동기로 대기"""
+        while True:
+            wait = self.try_acquire(method)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+class RateLimiter(BaseRateLimiter):
+    """
+    Riot API 응답 헤더 기반 rate limiter (프로세스 로컬)
+
+    - X-App-Rate-Limit / X-Method-Rate-Limit 헤더로 윈도우별 한도를 갱신한다.
+    - X-App-Rate-Limit-Count / X-Method-Rate-Limit-Count 헤더로 사용량을 보정한다.
+    - 429 응답의 Retry-After 동안은 permit을 내주지 않는다.
+    """
+
+    def __init__(self, app_limits: Optional[List[Tuple[int, int]]] = None):
+        """
+        Args:
+            app_limits: 헤더를 받기 전까지 사용할 app 한도 [(요청 수, 윈도우 초), ...]
+        """
+        if app_limits is None:
+            app_limits = parse_rate_limit_header(DEFAULT_APP_RATE_LIMIT)
+
+        self._lock = threading.Lock()
+        self._app_windows: Dict[int, RateLimitWindow] = {
+            seconds: RateLimitWindow(limit, seconds) for limit, seconds in app_limits
+        }
+        self._method_windows: Dict[str, Dict[int, RateLimitWindow]] = {}
+        self._app_blocked_until = 0.0
+        self._method_blocked_until: Dict[str, float] = {}
+
+    def _windows(self, method: str) -> List[RateLimitWindow]:
+        return list(self._app_windows.values()) + list(self._method_windows.get(method, {}).values())
+
+    def try_acquire(self, method: str) -> float:
+        with self._lock:
+            now = time.monotonic()
+
+            blocked_until = max(self._app_blocked_until, self._method_blocked_until.get(method, 0.0))
+            if blocked_until > now:
+                return blocked_until - now
+
+            windows = self._windows(method)
+            for window in windows:
+                window.refresh(now)
+
+            wait = max((window.wait_time(now) for window in windows), default=0.0)
+            if wait > 0:
+                return wait
+
+            for window in windows:
+                window.consume(now)
+            return 0.0
+
+    def available_permits(self, horizon: float) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if self._app_blocked_until > now:
+                horizon -= self._app_blocked_until - now
+                if horizon <= 0:
+                    return 0
+
+            budgets = []
+            for window in self._app_windows.values():
+                window.refresh(now)
+                until_reset = window.reset_at - now if window.reset_at else None
+                budgets.append(window_budget(window.limit, window.seconds, window.count, until_reset, horizon))
+            return max(min(budgets, default=0), 0)
+
+    def reset_delay(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self._app_blocked_until - now, 0.0)
+            for window in self._app_windows.values():
+                window.refresh(now)
+                delay = max(delay, window.wait_time(now))
+            return delay
+
+    def window_usage(self, methods: Iterable[str] = ()) -> List[Tuple[str, int, int, int]]:
+        with self._lock:
+            now = time.monotonic()
+            scopes = [("app", self._app_windows)]
+            scopes += [(f"method:{method}", self._method_windows.get(method, {})) for method in methods]
+
+            usage = []
+            for scope, windows in scopes:
+                for window in windows.values():
+                    window.refresh(now)
+                    usage.append((scope, window.seconds, window.count, window.limit))
+            return usage
+
+    def update(self, method: str, status_code: int, headers: Mapping[str, str]):
+        with self._lock:
+            now = time.monotonic()
+
+            app_limits = parse_rate_limit_header(headers.get("X-App-Rate-Limit"))
+            if app_limits:
+                self._app_windows = self._rebuild(self._app_windows, app_limits)
+            self._sync_counts(self._app_windows, headers.get("X-App-Rate-Limit-Count"), now)
+
+            method_limits = parse_rate_limit_header(headers.get("X-Method-Rate-Limit"))
+            if method_limits:
+                self._method_windows[method] = self._rebuild(self._method_windows.get(method, {}), method_limits)
+            if method in self._method_windows:
+                self._sync_counts(self._method_windows[method], headers.get("X-Method-Rate-Limit-Count"), now)
+
+            if status_code == 429:
+                blocked_until = now + retry_after_seconds(headers)
+
+                # method 한도 초과면 해당 메서드만, 그 외(app/service)는 전체 차단
+                if headers.get("X-Rate-Limit-Type") == "method":
+                    self._method_blocked_until[method] = max(self._method_blocked_until.get(method, 0.0), blocked_until)
+                else:
+                    self._app_blocked_until = max(self._app_blocked_until, blocked_until)
+
+    @staticmethod
+    def _rebuild(windows: Dict[int, RateLimitWindow], limits: List[Tuple[int, int]]) -> Dict[int, RateLimitWindow]:
+        """한도가 바뀌면 윈도우 재구성 (같은 길이의 윈도우는 사용량 유지)"""
+        rebuilt = {}
+        for limit, seconds in limits:
+            window = windows.get(seconds) or RateLimitWindow(limit, seconds)
+            window.limit = limit
+            rebuilt[seconds] = window
+        return rebuilt
+
+    @staticmethod
+    def _sync_counts(windows: Dict[int, RateLimitWindow], header: Optional[str], now: float):
+        for count, seconds in parse_rate_limit_header(header):
+            window = windows.get(seconds)
+            if window:
+                window.sync(count, now)
+
+
+class RedisRateLimiter(BaseRateLimiter):
+    """
+    Redis 기반 분산 rate limiter (같은 API 키를 쓰는 모든 worker가 한도 공유)
+
+    - 윈도우별 카운터를 Redis 키(rate_limit:app:<초>, rate_limit:method:<메서드>:<초>)로 관리한다.
+    - 헤더로 학습한 한도는 Redis에 저장해 다른 worker도 사용한다.
+    - 429 Retry-After 차단도 Redis 키 TTL로 공유한다.
+    - async_redis_client가 있으면 이벤트 루프에서는 비동기 클라이언트로 permit을 받는다.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        app_limits: Optional[List[Tuple[int, int]]] = None,
+        key_prefix: str = RATE_LIMIT_KEY_PREFIX,
+        async_redis_client: Optional[redis.asyncio.Redis] = None
+    ):
+        """
+        Args:
+            redis_client: Redis 클라이언트
+            app_limits: 헤더를 받기 전까지 사용할 app 한도 [(요청 수, 윈도우 초), ...]
+            key_prefix: Redis 키 prefix
+            async_redis_client: 비동기 Redis 클라이언트 (None이면 비동기 경로도 동기 클라이언트 사용)
+        """
+        if app_limits is None:
+            app_limits = parse_rate_limit_header(DEFAULT_APP_RATE_LIMIT)
+
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self._default_app_limits = app_limits
+        self._acquire_script = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._sync_script = redis_client.register_script(SYNC_SCRIPT)
+        self.async_redis_client = async_redis_client
+        if async_redis_client is not None:
+            self._async_acquire_script = async_redis_client.register_script(ACQUIRE_SCRIPT)
+            self._async_sync_script = async_redis_client.register_script(SYNC_SCRIPT)
+        self._limits_cache: Dict[str, Tuple[float, List[Tuple[int, int]]]] = {}
+
+    @staticmethod
+    def _scope(method: Optional[str]) -> str:
+        return "app" if method is None else f"method:{method}"
+
+    def _counter_key(self, scope: str, seconds: int) -> str:
+        return f"{self.key_prefix}:{scope}:{seconds}"
+
+    def _blocked_key(self, scope: str) -> str:
+        return f"{self.key_prefix}:{scope}:blocked"
+
+    def _limits_key(self, scope: str) -> str:
+        return f"{self.key_prefix}:{scope}:limits"
+
+    def _cached_limits(self, scope: str) -> Optional[List[Tuple[int, int]]]:
+        """로컬 캐시에 있는 scope의 한도 (LIMITS_CACHE_SECONDS가 지났으면 None)"""
+        cached = self._limits_cache.get(scope)
+        if cached and time.monotonic() - cached[0] < LIMITS_CACHE_SECONDS:
+            return cached[1]
+        return None
+
+    def _cache_limits(self, scope: str, header: Optional[str]) -> List[Tuple[int, int]]:
+        """Redis에서 읽은 한도 헤더를 파싱해 로컬 캐시에 저장"""
+        limits = parse_rate_limit_header(header)
+        if not limits and scope == "app":
+            limits = self._default_app_limits
+
+        self._limits_cache[scope] = (time.monotonic(), limits)
+        return limits
+
+    def _limits(self, scope: str) -> List[Tuple[int, int]]:
+        """scope의 한도 조회 (LIMITS_CACHE_SECONDS 동안 로컬 캐시)"""
+        limits = self._cached_limits(scope)
+        if limits is None:
+            limits = self._cache_limits(scope, self.redis_client.get(self._limits_key(scope)))
+        return limits
+
+    async def _limits_async(self, scope: str) -> List[Tuple[int, int]]:
+        """_limits의 비동기 버전 (캐시가 만료됐을 때만 비동기 클라이언트로 조회)"""
+        limits = self._cached_limits(scope)
+        if limits is None:
+            limits = self._cache_limits(scope, await self.async_redis_client.get(self._limits_key(scope)))
+        return limits
+
+    def _window_args(self, scope: str, limits: List[Tuple[int, int]]) -> Tuple[List[str], List[int]]:
+        keys, args = [], []
+        for limit, seconds in limits:
+            keys.append(self._counter_key(scope, seconds))
+            args.extend([limit, int((seconds + WINDOW_MARGIN_SECONDS) * 1000)])
+        return keys, args
+
+    def _acquire_args(
+        self,
+        method: str,
+        app_limits: List[Tuple[int, int]],
+        method_limits: List[Tuple[int, int]]
+    ) -> Tuple[List[str], List[int]]:
+        app_keys, app_args = self._window_args("app", app_limits)
+        method_scope = self._scope(method)
+        method_keys, method_args = self._window_args(method_scope, method_limits)
+        keys = [self._blocked_key("app"), self._blocked_key(method_scope), *app_keys, *method_keys]
+        return keys, [*app_args, *method_args]
+
+    def try_acquire(self, method: str) -> float:
+        keys, args = self._acquire_args(method, self._limits("app"), self._limits(self._scope(method)))
+        wait_ms = self._acquire_script(keys=keys, args=args)
+        return int(wait_ms) / 1000
+
+    async def try_acquire_async(self, method: str) -> float:
+        if self.async_redis_client is None:
+            return self.try_acquire(method)
+
+        app_limits = await self._limits_async("app")
+        method_limits = await self._limits_async(self._scope(method))
+        keys, args = self._acquire_args(method, app_limits, method_limits)
+        wait_ms = await self._async_acquire_script(keys=keys, args=args)
+        return int(wait_ms) / 1000
+
+    def _queue_app_usage(self, pipe, limits: List[Tuple[int, int]]):
+        """app 차단 키와 윈도우별 카운터/TTL 조회를 pipeline에 추가"""
+        pipe.pttl(self._blocked_key("app"))
+        for _, seconds in limits:
+            key = self._counter_key("app", seconds)
+            pipe.get(key)
+            pipe.pttl(key)
+
+    def available_permits(self, horizon: float) -> int:
+        limits = self._limits("app")
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._queue_app_usage(pipe, limits)
+        return self._permits_from_usage(limits, pipe.execute(), horizon)
+
+    async def available_permits_async(self, horizon: float) -> int:
+        if self.async_redis_client is None:
+            return self.available_permits(horizon)
+
+        limits = await self._limits_async("app")
+        pipe = self.async_redis_client.pipeline(transaction=False)
+        self._queue_app_usage(pipe, limits)
+        return self._permits_from_usage(limits, await pipe.execute(), horizon)
+
+    @staticmethod
+    def _permits_from_usage(limits: List[Tuple[int, int]], results: List, horizon: float) -> int:
+        """_queue_app_usage 결과로 horizon초 동안 사용할 수 있는 permit 수 계산"""
+        blocked_ms = results[0]
+        if blocked_ms > 0:
+            horizon -= blocked_ms / 1000
+            if horizon <= 0:
+                return 0
+
+        budgets = []
+        for idx, (limit, seconds) in enumerate(limits):
+            count = int(results[1 + idx * 2] or 0)
+            ttl_ms = results[2 + idx * 2]
+            until_reset = ttl_ms / 1000 if ttl_ms > 0 else None
+            budgets.append(window_budget(limit, seconds, count, until_reset, horizon))
+        return max(min(budgets, default=0), 0)
+
+    def reset_delay(self) -> float:
+        limits = self._limits("app")
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._queue_app_usage(pipe, limits)
+        results = pipe.execute()
+
+        delay_ms = max(results[0], 0)
+        for idx, (limit, _) in enumerate(limits):
+            count = int(results[1 + idx * 2] or 0)
+            ttl_ms = results[2 + idx * 2]
+            if count >= limit and ttl_ms > 0:
+                delay_ms = max(delay_ms, ttl_ms)
+        return delay_ms / 1000
+
+    def window_usage(self, methods: Iterable[str] = ()) -> List[Tuple[str, int, int, int]]:
+        windows = []
+        for scope in ["app", *[self._scope(method) for method in methods]]:
+            windows.extend((scope, limit, seconds) for limit, seconds in self._limits(scope))
+
+        counts = self.redis_client.mget([self._counter_key(scope, seconds) for scope, _, seconds in windows]) if windows else []
+        return [
+            (scope, seconds, int(count or 0), limit)
+            for (scope, limit, seconds), count in zip(windows, counts)
+        ]
+
+    def _header_updates(
+        self,
+        method: str,
+        headers: Mapping[str, str],
+        current_limits: Mapping[str, List[Tuple[int, int]]]
+    ) -> List[Tuple[str, Optional[str], List[str], List[int]]]:
+        """
+        응답 헤더로 갱신할 내용 계산
+
+        Args:
+            method: API 메서드 이름
+            headers: 응답 헤더
+            current_limits: scope별 현재 한도 (app, method)
+
+        Returns:
+            [(scope, 새 한도 헤더(바뀌지 않았으면 None), 사용량 보정 KEYS, 사용량 보정 ARGV), ...]
+        """
+        updates = []
+        for scope, limit_header, count_header in (
+            ("app", "X-App-Rate-Limit", "X-App-Rate-Limit-Count"),
+            (self._scope(method), "X-Method-Rate-Limit", "X-Method-Rate-Limit-Count"),
+        ):
+            new_limits = None
+            limits = parse_rate_limit_header(headers.get(limit_header))
+            if limits and limits != current_limits[scope]:
+                new_limits = headers[limit_header]
+                self._limits_cache[scope] = (time.monotonic(), limits)
+
+            keys, args = self._window_args(scope, parse_rate_limit_header(headers.get(count_header)))
+            updates.append((scope, new_limits, keys, args))
+        return updates
+
+    def _blocked_scope(self, method: str, headers: Mapping[str, str]) -> str:
+        """429 응답 시 차단할 scope (method 한도 초과면 해당 메서드만, 그 외(app/service)는 전체)"""
+        return self._scope(method) if headers.get("X-Rate-Limit-Type") == "method" else "app"
+
+    def update(self, method: str, status_code: int, headers: Mapping[str, str]):
+        current_limits = {scope: self._limits(scope) for scope in ("app", self._scope(method))}
+        for scope, new_limits, keys, args in self._header_updates(method, headers, current_limits):
+            if new_limits:
+                self.redis_client.set(self._limits_key(scope), new_limits, ex=LIMITS_TTL_SECONDS)
+            if keys:
+                self._sync_script(keys=keys, args=args)
+
+        if status_code == 429:
+            blocked_key = self._blocked_key(self._blocked_scope(method, headers))
+            delay_ms = int(retry_after_seconds(headers) * 1000)
+            if self.redis_client.pttl(blocked_key) < delay_ms:
+                self.redis_client.set(blocked_key, 1, px=delay_ms)
+
+    async def update_async(self, method: str, status_code: int, headers: Mapping[str, str]):
+        if self.async_redis_client is None:
+            return self.update(method, status_code, headers)
+
+        current_limits = {scope: await self._limits_async(scope) for scope in ("app", self._scope(method))}
+        for scope, new_limits, keys, args in self._header_updates(method, headers, current_limits):
+            if new_limits:
+                await self.async_redis_client.set(self._limits_key(scope), new_limits, ex=LIMITS_TTL_SECONDS)
+            if keys:
+                await self._async_sync_script(keys=keys, args=args)
+
+        if status_code == 429:
+            blocked_key = self._blocked_key(self._blocked_scope(method, headers))
+            delay_ms = int(retry_after_seconds(headers) * 1000)
+            if await self.async_redis_client.pttl(blocked_key) < delay_ms:
+                await self.async_redis_client.set(blocked_key, 1, px=delay_ms)
+
+
+# 전역 인스턴스 (worker 프로세스 단위로 윈도우 상태 유지)
+_rate_limiter: Optional[BaseRateLimiter] = None
+
+
+def get_rate_limiter() -> BaseRateLimiter:
+    """
+    rate limiter 싱글톤 인스턴스 반환
+
+    RIOT_RATE_LIMIT_BACKEND가 redis이면 모든 worker가 공유하는 RedisRateLimiter,
+    local이면 프로세스 단위 RateLimiter를 사용한다.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        if RATE_LIMIT_BACKEND == "redis":
+            from db.redis import get_redis_client, get_async_redis_client
+            _rate_limiter = RedisRateLimiter(get_redis_client(), async_redis_client=get_async_redis_client())
+        else:
+            _rate_limiter = RateLimiter()
+    return _rate_limiter
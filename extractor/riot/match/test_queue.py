@@ -0,0 +1,94 @@
+import os
+import sys
+import asyncio
+
+# extractor/riot을 sys.path에 추가 (모듈이 "from match..." 형식으로 import함)
+riot_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, riot_root)
+
+import fakeredis
+import pytest
+import db.redis as redis_module
+from match.queue import MAX_MATCH_ATTEMPTS, MatchIdQueue
+
+
+@pytest.fixture
+def queue():
+    """fakeredis(Lua 지원)로 Lua 스크립트를 실행하는 테스트용 match_id 큐"""
+    # 동기/비동기 클라이언트가 같은 fake 서버를 보도록 공유
+    server = fakeredis.FakeServer()
+    previous = redis_module._redis_client, redis_module._async_redis_client
+    redis_module._redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    redis_module._async_redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    try:
+        yield MatchIdQueue()
+    finally:
+        redis_module._redis_client, redis_module._async_redis_client = previous
+
+
+def test_lease_then_ack_marks_processed(queue):
+    assert queue.add_match_ids(["KR_1", "KR_2", "KR_1"]) == [True, True, False]
+
+    assert queue.lease_match_ids(10) == ["KR_1", "KR_2"]
+    queue.ack_match_id("KR_1")
+    queue.ack_match_ids(["KR_2"])
+
+    assert queue.processing_size() == 0
+    assert queue.set_size() == 0
+    assert queue.is_processed("KR_1") and queue.is_processed("KR_2")
+
+
+def test_processed_bit_blocks_re_add(queue):
+    queue.add_match_id("KR_7234567890")
+    queue.lease_match_ids(1)
+    queue.ack_match_id("KR_7234567890")
+
+    assert queue.add_match_id("KR_7234567890") is False
+    assert queue.add_match_ids(["KR_7234567890", "KR_7234567891", "EUW1_7234567890"]) == [False, True, True]
+    assert queue.queue_size() == 2
+
+
+def test_invalid_match_id_uses_set_only(queue):
+    assert queue.add_match_ids(["invalid", "invalid"]) == [True, False]
+    assert queue.is_processed("invalid") is False
+
+
+def test_nack_moves_to_dead_letter_after_max_attempts(queue):
+    queue.add_match_id("KR_1")
+
+    for _ in range(MAX_MATCH_ATTEMPTS - 1):
+        assert queue.lease_match_ids(1) == ["KR_1"]
+        assert queue.nack_match_id("KR_1") is True
+
+    assert queue.lease_match_ids(1) == ["KR_1"]
+    assert queue.nack_match_id("KR_1") is False
+    assert queue.queue_size() == 0
+    assert queue.dead_letter_size() == 1
+    # dead-letter로 간 match_id는 처리 완료가 아니므로 다시 추가할 수 있다
+    assert queue.is_processed("KR_1") is False
+    assert queue.add_match_id("KR_1") is True
+
+
+def test_release_puts_match_ids_back_in_order(queue):
+    queue.add_match_ids(["KR_1", "KR_2", "KR_3"])
+    leased = queue.lease_match_ids(2)
+
+    assert queue.release_match_ids(leased) == 2
+    assert queue.lease_match_ids(3) == ["KR_1", "KR_2", "KR_3"]
+
+
+def test_async_methods_share_scripts_with_sync_path(queue):
+    queue.add_match_ids(["KR_1", "KR_2", "KR_3"])
+
+    async def scenario():
+        leased = await queue.lease_match_ids_async(3)
+        await queue.ack_match_id_async("KR_1")
+        assert await queue.nack_match_id_async("KR_2") is True
+        assert await queue.release_match_ids_async(["KR_3"]) == 1
+        return leased
+
+    assert asyncio.run(scenario()) == ["KR_1", "KR_2", "KR_3"]
+    assert queue.is_processed("KR_1") is True
+    assert queue.add_match_id("KR_1") is False
+    assert queue.processing_size() == 0
+    assert queue.lease_match_ids(3) == ["KR_3", "KR_2"]
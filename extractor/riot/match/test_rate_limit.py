@@ -0,0 +1,116 @@
+import os
+import sys
+import asyncio
+
+# extractor/riot을 sys.path에 추가 (모듈이 "from match..." 형식으로 import함)
+riot_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, riot_root)
+
+import fakeredis
+from match.rate_limit import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    RateLimiter,
+    RedisRateLimiter,
+    parse_rate_limit_header,
+    retry_after_seconds,
+    window_budget,
+)
+
+
+def test_parse_rate_limit_header():
+    assert parse_rate_limit_header("20:1,100:120") == [(20, 1), (100, 120)]
+    assert parse_rate_limit_header(" 20:1 , 100:120 ") == [(20, 1), (100, 120)]
+    assert parse_rate_limit_header(None) == []
+    assert parse_rate_limit_header("") == []
+
+
+def test_parse_rate_limit_header_skips_malformed_entries():
+    assert parse_rate_limit_header("20:1,abc:120,100:x,:5,7,100:120") == [(20, 1), (100, 120)]
+    assert parse_rate_limit_header("20:0,-1:10") == []
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds({"Retry-After": "3"}) == 3.0
+    assert retry_after_seconds({}) == DEFAULT_RETRY_AFTER_SECONDS
+    assert retry_after_seconds({"Retry-After": "soon"}) == DEFAULT_RETRY_AFTER_SECONDS
+
+
+def test_window_budget():
+    # 리셋 전: 남은 한도만
+    assert window_budget(100, 120, 30, until_reset=60, horizon=30) == 70
+    # horizon 안에 한 번 리셋
+    assert window_budget(100, 120, 30, until_reset=10, horizon=30) == 170
+    # 윈도우 시작 전
+    assert window_budget(20, 1, 0, until_reset=None, horizon=0.5) == 20
+
+
+def test_rate_limiter_blocks_when_window_is_full():
+    limiter = RateLimiter(app_limits=[(2, 10)])
+    assert limiter.try_acquire("match") == 0
+    assert limiter.try_acquire("match") == 0
+    assert limiter.try_acquire("match") > 9
+    assert limiter.available_permits(5) == 0
+
+
+def test_rate_limiter_learns_limits_and_counts_from_headers():
+    limiter = RateLimiter(app_limits=[(100, 120)])
+    limiter.update("match", 200, {
+        "X-App-Rate-Limit": "20:1,100:120",
+        "X-App-Rate-Limit-Count": "1:1,95:120",
+        "X-Method-Rate-Limit": "2000:10",
+        "X-Method-Rate-Limit-Count": "1:10",
+    })
+    usage = limiter.window_usage(["match"])
+    assert ("app", 120, 95, 100) in usage
+    assert ("app", 1, 1, 20) in usage
+    assert ("method:match", 10, 1, 2000) in usage
+    assert limiter.available_permits(60) == 5
+
+
+def test_rate_limiter_ignores_malformed_headers():
+    limiter = RateLimiter(app_limits=[(100, 120)])
+    limiter.update("match", 200, {"X-App-Rate-Limit": "garbage", "X-App-Rate-Limit-Count": "1:x"})
+    assert limiter.window_usage() == [("app", 120, 0, 100)]
+
+
+def test_retry_after_blocks_app():
+    limiter = RateLimiter(app_limits=[(100, 120)])
+    limiter.update("match", 429, {"Retry-After": "5", "X-Rate-Limit-Type": "application"})
+    assert 4 < limiter.try_acquire("match") <= 5
+    assert 4 < limiter.try_acquire("account") <= 5
+    assert 4 < limiter.reset_delay() <= 5
+
+
+def test_retry_after_method_limit_blocks_only_that_method():
+    limiter = RateLimiter(app_limits=[(100, 120)])
+    limiter.update("match", 429, {"Retry-After": "5", "X-Rate-Limit-Type": "method"})
+    assert 4 < limiter.try_acquire("match") <= 5
+    assert limiter.try_acquire("account") == 0
+    assert limiter.reset_delay() == 0
+
+
+class SyncClientUnused(fakeredis.FakeRedis):
+    """비동기 경로에서 동기 클라이언트로 한도를 조회하면 실패하는 클라이언트"""
+
+    def get(self, name):
+        raise AssertionError(f"sync GET on the async path: {name}")
+
+
+def test_redis_rate_limiter_async_path_uses_async_client():
+    server = fakeredis.FakeServer()
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    limiter = RedisRateLimiter(
+        SyncClientUnused(server=server, decode_responses=True),
+        app_limits=[(2, 10)],
+        async_redis_client=async_client
+    )
+
+    async def scenario():
+        await async_client.set("rate_limit:method:match:limits", "1:10")
+        assert await limiter.available_permits_async(0) == 2
+        assert await limiter.try_acquire_async("match") == 0
+        assert await limiter.try_acquire_async("match") > 9
+        await limiter.update_async("match", 200, {"X-App-Rate-Limit": "5:10"})
+        assert await limiter.available_permits_async(0) == 4
+
+    asyncio.run(scenario())
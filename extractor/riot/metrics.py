@@ -0,0 +1,239 @@
+import os
+import math
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from db.redis import get_redis_client
+from dotenv import load_dotenv
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# 카운터 HASH 키 (prefork worker 프로세스들이 같은 값을 누적)
+METRICS_KEY = "metrics:counters"
+
+# /metrics HTTP 서버 포트
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9100))
+
+# 카운터 설명 (Prometheus HELP)
+COUNTER_HELP = {
+    "riot_api_responses_total": "Riot API responses by method and HTTP status",
+    "riot_api_errors_total": "Riot API requests that failed without a response",
+    "aram_matches_processed_total": "Match IDs taken from the queue and fetched",
+    "aram_matches_saved_total": "ARAM matches saved to MongoDB",
+    "aram_matches_skipped_total": "Fetched matches that were not ARAM",
+    "aram_matches_existing_total": "Match IDs skipped because the match was already stored",
+    "aram_matches_dropped_total": "Match IDs dropped as not found or permanently failing",
+    "aram_matches_requeued_total": "Match IDs returned to the queue for retry",
+    "aram_matches_dead_lettered_total": "Match IDs moved to the dead-letter queue",
+    "aram_users_crawled_total": "Users whose match ID list was fetched",
+    "aram_match_ids_added_total": "New match IDs added to the match queue",
+}
+
+# histogram 설명 (Prometheus HELP)
+HISTOGRAM_HELP = {
+    "aram_stage_duration_seconds": "Duration of each traced pipeline stage",
+}
+
+# histogram bucket 경계 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 프로세스 로컬 카운터 (요청마다 Redis에 쓰지 않고 task가 끝날 때 한 번에 flush)
+_pending: Counter = Counter()
+_lock = threading.Lock()
+
+
+def _field(name: str, labels: Dict[str, object]) -> str:
+    """Prometheus 형식 metric 이름 (예: riot_api_responses_total{method="match-detail",status="200"})"""
+    if not labels:
+        return name
+    label_text = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{label_text}}}"
+
+
+def inc(name: str, value: int = 1, **labels):
+    """
+    카운터 증가 (flush 전까지 프로세스 메모리에만 누적)
+
+    Args:
+        name: metric 이름 (_total로 끝나는 카운터)
+        value: 증가량
+        labels: metric label
+    """
+    if value:
+        with _lock:
+            _pending[_field(name, labels)] += value
+
+
+def observe(name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels):
+    """
+    histogram에 값 기록 (bucket/sum/count 카운터로 누적)
+
+    Args:
+        name: metric 이름
+        value: 관측값
+        buckets: bucket 경계
+        labels: metric label
+    """
+    with _lock:
+        for bound in buckets:
+            if value <= bound:
+                _pending[_field(f"{name}_bucket", {**labels, "le": bound})] += 1
+        _pending[_field(f"{name}_bucket", {**labels, "le": "+Inf"})] += 1
+        _pending[_field(f"{name}_sum", labels)] += value
+        _pending[_field(f"{name}_count", labels)] += 1
+
+
+def flush():
+    """누적된 카운터를 Redis HASH에 반영"""
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+
+    if not pending:
+        return
+
+    try:
+        pipe = get_redis_client().pipeline(transaction=False)
+        for field, value in pending.items():
+            if isinstance(value, float):
+                pipe.hincrbyfloat(METRICS_KEY, field, value)
+            else:
+                pipe.hincrby(METRICS_KEY, field, value)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to flush metrics: {e}")
+
+
+def _histogram_sort_key(field: str) -> Tuple[str, float]:
+    """같은 label끼리 모으고 bucket은 le 오름차순으로 정렬"""
+    if 'le="' not in field:
+        return field, math.inf
+    prefix, le = field.split('le="', 1)
+    le = le.split('"', 1)[0]
+    return prefix, math.inf if le == "+Inf" else float(le)
+
+
+def _gauges() -> List[Tuple[str, str, List[Tuple[str, float]]]]:
+    """
+    현재 상태 gauge 조회 (queue 길이, rate limit 윈도우 사용량)
+
+    Returns:
+        [(metric 이름, 설명, [(label 포함 이름, 값), ...]), ...]
+    """
+    from match.api import METHOD_MATCH_IDS, METHOD_MATCH_DETAIL, METHOD_MATCH_TIMELINE
+    from match.queue import MatchIdQueue
+    from match.rate_limit import get_rate_limiter
+    from user.frontier import UserFrontier
+    from user.queue import UserIdQueue
+
+    match_queue = MatchIdQueue()
+    user_queue = UserIdQueue()
+
+    queue_sizes = []
+    set_sizes = []
+    for queue_name, queue in (("match", match_queue), ("user", user_queue)):
+        queue_sizes.append((_field("aram_queue_size", {"queue": queue_name}), queue.queue_size()))
+        set_sizes.append((_field("aram_queue_set_size", {"queue": queue_name}), queue.set_size()))
+
+    used = []
+    limits = []
+    methods = (METHOD_MATCH_IDS, METHOD_MATCH_DETAIL, METHOD_MATCH_TIMELINE)
+    for scope, seconds, count, limit in get_rate_limiter().window_usage(methods):
+        labels = {"scope": scope, "window": seconds}
+        used.append((_field("riot_rate_limit_permits_used", labels), count))
+        limits.append((_field("riot_rate_limit_permits_limit", labels), limit))
+
+    return [
+        ("aram_queue_size", "Items waiting in each Redis queue", queue_sizes),
+        ("aram_queue_set_size", "Items in each queue's dedup set", set_sizes),
+        ("aram_match_queue_processing", "Match IDs currently leased by workers",
+         [("aram_match_queue_processing", match_queue.processing_size())]),
+        ("aram_match_queue_dead_letter", "Match IDs in the dead-letter queue",
+         [("aram_match_queue_dead_letter", match_queue.dead_letter_size())]),
+        ("aram_user_frontier_size", "Users waiting in the crawl frontier",
+         [("aram_user_frontier_size", UserFrontier().size())]),
+        ("riot_rate_limit_permits_used", "Requests counted in the current rate limit window", used),
+        ("riot_rate_limit_permits_limit", "Request limit of each rate limit window", limits),
+    ]
+
+
+def render() -> str:
+    """
+    Prometheus text exposition 형식으로 모든 metric 반환
+
+    Returns:
+        str: /metrics 응답 본문
+    """
+    lines = []
+
+    counters = get_redis_client().hgetall(METRICS_KEY)
+    for name, help_text in COUNTER_HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for field in sorted(counters):
+            if field == name or field.startswith(f"{name}{{"):
+                lines.append(f"{field} {counters[field]}")
+
+    for name, help_text in HISTOGRAM_HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        fields = [
+            field for field in counters
+            if field.startswith((f"{name}_bucket{{", f"{name}_sum", f"{name}_count"))
+        ]
+        for field in sorted(fields, key=_histogram_sort_key):
+            lines.append(f"{field} {counters[field]}")
+
+    for name, help_text, samples in _gauges():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for field, value in samples:
+            lines.append(f"{field} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics 요청 처리"""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        try:
+            body = render().encode()
+        except Exception as e:
+            logger.error(f"Error rendering metrics: {e}", exc_info=True)
+            self.send_error(500)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve(port: int = METRICS_PORT):
+    """
+    /metrics HTTP 서버 실행 (worker와 별도 프로세스로 실행)
+
+    Args:
+        port: listen 포트
+    """
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    logger.info(f"Serving metrics on :{port}/metrics")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    serve()
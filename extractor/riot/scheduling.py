@@ -0,0 +1,109 @@
+import os
+import uuid
+import functools
+from typing import Any, Callable, Optional
+from celery_app import celery_app
+from db.redis import get_redis_client
+from dotenv import load_dotenv
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# 실행 방식 (singleton: 한 번에 하나만 실행하고 끝나면 다음 실행 예약, beat: beat 주기마다 실행)
+SCHEDULE_MODE = os.getenv("SCHEDULE_MODE", "singleton").lower()
+
+# 실행 중 lock 유지 시간 (초), worker가 죽어도 이 시간이 지나면 lock이 풀림
+TASK_LOCK_TIMEOUT_SECONDS = int(os.getenv("TASK_LOCK_TIMEOUT_SECONDS", 15 * 60))
+
+# 예약된 다음 실행보다 이만큼 먼저 예약 표시를 풀어서, 예약된 실행이 스스로를 건너뛰지 않게 함 (초)
+NEXT_RUN_MARGIN_SECONDS = 1.0
+
+# Redis 키 prefix
+SCHEDULE_KEY_PREFIX = "schedule"
+
+# lock 해제 (내가 잡은 lock일 때만 삭제)
+# KEYS: [lock 키]
+# ARGV: [lock 토큰]
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class TaskLock:
+    """task 중복 실행 방지용 Redis lock (SET NX PX)"""
+
+    def __init__(self, name: str, timeout: int = TASK_LOCK_TIMEOUT_SECONDS):
+        """
+        Args:
+            name: task 이름
+            timeout: lock 유지 시간 (초)
+        """
+        self.redis_client = get_redis_client()
+        self.key = f"{SCHEDULE_KEY_PREFIX}:{name}:lock"
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+        self._release_script = self.redis_client.register_script(RELEASE_LOCK_SCRIPT)
+
+    def acquire(self) -> bool:
+        """
+        lock 획득 시도
+
+        Returns:
+            bool: 획득 성공 여부 (다른 실행이 잡고 있으면 False)
+        """
+        return bool(self.redis_client.set(self.key, self.token, nx=True, px=self.timeout * 1000))
+
+    def release(self):
+        """lock 해제 (만료 후 다른 실행이 잡은 lock은 건드리지 않음)"""
+        self._release_script(keys=[self.key], args=[self.token])
+
+
+def singleton(task_name: str, next_delay: Callable[[Optional[Any]], float]) -> Callable:
+    """
+    SCHEDULE_MODE=singleton이면 task를 한 번에 하나만 실행하고, 끝나면 next_delay초 뒤로 다음 실행을 예약하는 decorator
+
+    - 실행 중이면(lock) 또는 다음 실행이 예약되어 있으면 beat가 보낸 실행은 건너뛴다.
+    - beat는 예약이 끊겼을 때(worker 재시작 등) 다시 시작시키는 역할만 한다.
+
+    Args:
+        task_name: Celery task 이름
+        next_delay: 실행 결과를 받아 다음 실행까지 기다릴 시간(초)을 돌려주는 함수
+    """
+    def decorator(func: Callable) -> Callable:
+        if SCHEDULE_MODE != "singleton":
+            return func
+
+        next_run_key = f"{SCHEDULE_KEY_PREFIX}:{task_name}:next"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            redis_client = get_redis_client()
+            if redis_client.exists(next_run_key):
+                return {"status": "scheduled"}
+
+            lock = TaskLock(task_name)
+            if not lock.acquire():
+                return {"status": "already_running"}
+
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                try:
+                    delay = max(next_delay(result), 0.0)
+                    if delay > NEXT_RUN_MARGIN_SECONDS:
+                        redis_client.set(next_run_key, 1, px=int((delay - NEXT_RUN_MARGIN_SECONDS) * 1000))
+                    celery_app.send_task(task_name, countdown=delay)
+                    logger.info(f"Scheduled next {task_name} run in {delay:.1f}s")
+                except Exception as e:
+                    logger.error(f"Failed to schedule next {task_name} run: {e}", exc_info=True)
+                finally:
+                    lock.release()
+        return wrapper
+    return decorator
@@ -1,12 +1,31 @@
 import os
+import math
 import asyncio
 import time
+from collections import deque
+from functools import lru_cache
 from typing import Tuple
-import httpx
+from celery.signals import worker_process_shutdown, worker_ready
 from celery_app import celery_app
+from user.frontier import UserFrontier
 from user.queue import UserIdQueue
-from match.api import get_match_ids, get_match_detail_async, get_match_timeline_async
-from db.mongodb import get_mongodb_client
+from user.watermark import CrawlWatermark
+from match.api import (
+    get_match_ids_async,
+    get_match_detail_async,
+    get_match_timeline_async,
+    RiotApiError,
+    RiotAuthError,
+    ARAM_QUEUE_ID,
+    MAX_MATCH_IDS_PER_PAGE,
+)
+from match.rate_limit import get_rate_limiter
+from match.client import run, get_async_client, close as close_http_clients
+from db.mongodb import MongoDBClient, get_mongodb_client, close_mongodb_client
+from db.redis import close_async_redis_client
+import metrics
+import tracing
+import scheduling
 from dotenv import load_dotenv
 import logging
 
@@ -14,9 +33,45 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-# Riot API Rate Limit
-MAX_REQUESTS_PER_2MIN = 2000
-BATCH_SIZE = 200  # 1초당 최대 200개 동시 처리
+# match 1개당 최대 API 요청 수 (detail + timeline)
+REQUESTS_PER_MATCH = 2
+
+# Redis에서 한 번에 가져올 최대 match_id 개수
+MATCH_POP_BATCH_SIZE = 200
+
+# 동시에 조회/처리 중인 최대 match 수
+MAX_IN_FLIGHT_MATCHES = int(os.getenv("MAX_IN_FLIGHT_MATCHES", 100))
+
+# detail로 ARAM 여부를 확인한 뒤에만 timeline 요청 (false면 detail/timeline 동시 요청)
+TWO_PHASE_FETCH = os.getenv("RIOT_TWO_PHASE_FETCH", "true").lower() == "true"
+
+# task 실행 주기 (celery_app beat_schedule과 동일)
+RUN_INTERVAL_SECONDS = 120.0
+
+# user 1명당 조회할 최대 match_id 페이지 수 (페이지당 100개)
+MAX_MATCH_ID_PAGES = 5
+
+# MatchIdQueue 목표 길이 (이보다 짧으면 부족한 만큼 user를 조회)
+MATCH_QUEUE_TARGET_DEPTH = int(os.getenv("MATCH_QUEUE_TARGET_DEPTH", 4000))
+
+# 한 번 실행에 조회할 user 수 범위
+MIN_USERS_PER_TICK = 1
+MAX_USERS_PER_TICK = int(os.getenv("MAX_USERS_PER_TICK", 200))
+
+# match_id 목록 조회가 쓰지 않고 get_match_info 몫으로 남겨둘 app rate limit 비율 (0~1)
+MATCH_INFO_BUDGET_RESERVE = float(os.getenv("MATCH_INFO_BUDGET_RESERVE", 0.5))
+
+# 처리할 것이 없을 때 다음 실행까지 기다릴 시간 (SCHEDULE_MODE=singleton)
+IDLE_RESCHEDULE_SECONDS = 30.0
+
+# 다음 실행까지 최소 대기 시간 (한도가 거의 찬 상태에서 바로 재실행을 반복하지 않도록)
+MIN_RESCHEDULE_SECONDS = 1.0
+
+# UserFrontier가 비어있을 때 이전 UserIdQueue에서 한 번에 옮길 최대 user 수
+MAX_FRONTIER_MIGRATION_BATCH = 1000
+
+# worker 시작 시 match 컬렉션 인덱스 생성 및 explain 확인 여부
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
 
 # 기본 초기 user_id 목록 (큐가 비어있을 때 사용)
 DEFAULT_INITIAL_USER_IDS = [
@@ -25,230 +80,513 @@ DEFAULT_INITIAL_USER_IDS = [
 ]
 
 
+@lru_cache(maxsize=None)
+def get_match_queue():
+    """worker 프로세스에서 재사용할 MatchIdQueue (공유 Redis connection pool 사용)"""
+    from match.queue import MatchIdQueue
+    return MatchIdQueue()
+
+
+@lru_cache(maxsize=None)
+def get_user_frontier() -> UserFrontier:
+    """worker 프로세스에서 재사용할 UserFrontier"""
+    return UserFrontier()
+
+
+@lru_cache(maxsize=None)
+def get_crawl_watermark() -> CrawlWatermark:
+    """worker 프로세스에서 재사용할 CrawlWatermark"""
+    return CrawlWatermark()
+
+
+@worker_ready.connect
+def ensure_mongodb_indexes(**kwargs):
+    """
+    worker 시작 시 match 컬렉션 인덱스 생성 후 조회 경로별 인덱스 사용 여부 기록 (MONGO_ENSURE_INDEXES=true)
+
+    fork된 worker 프로세스가 연결을 물려받지 않도록 별도 클라이언트를 만들고 바로 닫는다.
+    """
+    if not MONGO_ENSURE_INDEXES:
+        return
+
+    client = None
+    try:
+        client = MongoDBClient()
+        logger.info(f"Ensured MongoDB indexes: {client.ensure_indexes()}")
+        for query_name, stage in client.check_index_usage().items():
+            if stage == "COLLSCAN":
+                logger.warning(f"Query {query_name} does not use an index (COLLSCAN)")
+            else:
+                logger.info(f"Query {query_name} uses an index ({stage})")
+    except Exception as e:
+        logger.error(f"Failed to ensure MongoDB indexes: {e}", exc_info=True)
+    finally:
+        if client is not None:
+            client.close()
+
+
+@worker_process_shutdown.connect
+def close_shared_clients(**kwargs):
+    """worker 프로세스 종료 시 공유 HTTP/Redis/MongoDB 클라이언트 정리"""
+    run(close_async_redis_client())
+    close_http_clients()
+    close_mongodb_client()
+
+
+def next_run_delay(result) -> float:
+    """
+    다음 실행까지 기다릴 시간 (SCHEDULE_MODE=singleton)
+
+    처리할 것이 없었으면 IDLE_RESCHEDULE_SECONDS, 아니면 rate limit 윈도우가 초기화될 때까지 기다린다.
+    """
+    if not isinstance(result, dict) or result.get("status") in ("error", "no_matches", "no_users", "queue_full"):
+        return IDLE_RESCHEDULE_SECONDS
+    return max(get_rate_limiter().reset_delay(), MIN_RESCHEDULE_SECONDS)
+
+
 @celery_app.task(name="tasks.get_match_detail")
+@scheduling.singleton("tasks.get_match_detail", next_run_delay)
+@tracing.traced("tasks.get_match_detail")
 def get_match_info():
     """
-    - match_id를 redis에서 가져와 match_info와 match_timeline을 가져온다.
-    - match_info와 match_timeline을 하나의 document로 합쳐 mongodb에 저장한다.
-    - match_info에 있는 user_id를 큐에 추가한다. (중복 제거 및 set에 넣을때 ttl 6시간)
+    - match_id를 redis에서 가져와 match_info를 가져오고, ARAM이면 match_timeline을 가져온다.
+    - match_info는 match 컬렉션에, match_timeline은 match_detail 컬렉션에 (압축해서) 저장한다. (MONGO_TIMELINE_STORAGE=embedded면 하나의 document로 합쳐 저장)
+    - match_info에 있는 user_id를 UserFrontier에 추가한다. (최근 6시간 내 조회한 user는 제외)
     """
-    from match.queue import MatchIdQueue
-
-    match_queue = MatchIdQueue()
-    user_queue = UserIdQueue()
+    match_queue = get_match_queue()
+    user_frontier = get_user_frontier()
     riot_api_key = os.getenv("RIOT_API_KEY")
 
     if not riot_api_key:
         logger.error("RIOT_API_KEY not found in environment variables")
         return {"status": "error", "message": "No API key"}
 
-    max_matches = MAX_REQUESTS_PER_2MIN
-    match_ids = []
-
-    for _ in range(max_matches):
-        match_id = match_queue.get_match_id()
-        if not match_id:
-            break
-        match_ids.append(match_id)
-
-    if not match_ids:
-        logger.info("MatchIdQueue is empty")
-        return {"status": "no_matches"}
-
-    logger.info(f"Processing {len(match_ids)} match_ids")
-
-    # 비동기 배치 처리 함수
-    async def process_matches_batch(match_ids_batch):
-        saved_count = 0
-        participants_added = 0
-        request_count = 0
+    # 이전 실행에서 처리하지 못하고 lease가 만료된 match_id 복구
+    reaped = match_queue.reap_expired_match_ids()
+    if reaped:
+        logger.warning(f"Returned {reaped} expired match_id leases to the queue")
+
+    # 다음 실행 전까지 사용할 수 있는 app rate limit 만큼만 사용한다
+    limiter = get_rate_limiter()
+    request_budget = limiter.available_permits(RUN_INTERVAL_SECONDS)
+
+    if request_budget < REQUESTS_PER_MATCH:
+        logger.info("Rate limit budget exhausted, skipping this run")
+        return {"status": "rate_limited"}
+
+    async def fetch_match(match_id, client):
+        """
+        match detail/timeline 조회
+
+        Returns:
+            (detail, timeline, 사용한 요청 수)
+        """
+        if TWO_PHASE_FETCH:
+            # detail이 ARAM일 때만 timeline 요청
+            detail = await get_match_detail_async(match_id, riot_api_key, client, limiter)
+            if not detail or detail.get("info", {}).get("gameMode") != "ARAM":
+                return detail, None, 1
+
+            timeline = await get_match_timeline_async(match_id, riot_api_key, client, limiter)
+            return detail, timeline, 2
+
+        # detail과 timeline을 동시에 요청
+        detail, timeline = await asyncio.gather(
+            get_match_detail_async(match_id, riot_api_key, client, limiter),
+            get_match_timeline_async(match_id, riot_api_key, client, limiter)
+        )
+        return detail, timeline, 2
+
+    # 비동기 파이프라인 처리 함수
+    async def process_matches_pipeline(budget):
+        counts = {
+            "processed": 0,
+            "saved": 0,
+            "participants": 0,
+            "requests": 0,
+            "requeued": 0,
+            "dead_lettered": 0,
+            "dropped": 0,
+            "skipped": 0,
+            "existing": 0,
+        }
 
         mongodb = get_mongodb_client()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # BATCH_SIZE씩 처리
-            for i in range(0, len(match_ids_batch), BATCH_SIZE):
-                batch = match_ids_batch[i:i + BATCH_SIZE]
-
-                logger.info(f"Processing batch {i//BATCH_SIZE + 1}: {len(batch)} matches")
-
-                # detail과 timeline을 동시에 요청
-                detail_tasks = [
-                    get_match_detail_async(match_id, riot_api_key, client)
-                    for match_id in batch
-                ]
-                timeline_tasks = [
-                    get_match_timeline_async(match_id, riot_api_key, client)
-                    for match_id in batch
-                ]
-
-                # 모든 요청을 동시에 실행
-                results = await asyncio.gather(
-                    *detail_tasks,
-                    *timeline_tasks,
-                    return_exceptions=True
-                )
-
-                # 결과 분리
-                batch_size = len(batch)
-                match_details = results[:batch_size]
-                match_timelines = results[batch_size:]
-
-                request_count += batch_size * 2
-
-                # 각 match 처리
-                for idx, match_id in enumerate(batch):
-                    detail = match_details[idx]
-                    timeline = match_timelines[idx]
-
-                    # 에러 처리
-                    if isinstance(detail, Exception):
-                        logger.error(f"Error fetching detail for {match_id}: {detail}")
-                        detail = None
-                    if isinstance(timeline, Exception):
-                        logger.error(f"Error fetching timeline for {match_id}: {timeline}")
-                        timeline = None
-
-                    # 둘 다 실패하면 스킵
-                    if not detail and not timeline:
-                        logger.warning(f"Skipping {match_id}: both API calls failed")
-                        continue
-
-                    try:
-                        # 병합 document 생성
-                        merged_doc = {}                        
-
-                        if detail:
-                            # 매치 참가자 user_id 추출
-                            participants = detail.get("metadata", {}).get("participants", [])
-
-                            TTL_6_HOURS = 6 * 60 * 60  # 21600 seconds
-
-                            for participant_id in participants:
-                                if participant_id:
-                                    if user_queue.add_user_id(participant_id, ttl=TTL_6_HOURS):
-                                        participants_added += 1
-
-                            # 기본 detail 설정
-                            merged_doc = {**detail}  # detail을 기본으로
-
-                            # ARAM 필터링
-                            game_mode = detail.get("info", {}).get("gameMode")
-                            if game_mode != "ARAM":
-                                logger.info(f"Skipping {match_id}: not ARAM (mode: {game_mode})")
-                                continue
-
-                        if timeline:
-                            # timeline을 "timeline" 키 아래에 중첩
-                            merged_doc["timeline"] = timeline
-
-                        # MongoDB에 병합 document 저장
-                        # 실제 몽고디비 사용시 아래 주석 제거 후 logger.info 주석 처리
-                        if mongodb.save_match(merged_doc):
-                            saved_count += 1
-                            logger.info(f"Saved merged document for {match_id}")
-
-                        # logger.info(f"Merged document: {merged_doc}")
-
-                        
-
-                    except Exception as e:
-                        logger.error(f"Error processing {match_id}: {str(e)}", exc_info=True)
-                        continue
-
-                # 배치 간 1초 대기
-                if i + BATCH_SIZE < len(match_ids_batch):
-                    logger.info("Waiting 1 second before next batch...")
-                    await asyncio.sleep(1.0)
-
-        return saved_count, participants_added, request_count
+        async def requeue(match_id):
+            if await match_queue.nack_match_id_async(match_id):
+                counts["requeued"] += 1
+            else:
+                logger.warning(f"Moved {match_id} to dead-letter queue: too many attempts")
+                counts["dead_lettered"] += 1
+
+        async def handle_match(match_id, detail, timeline):
+            # detail이 없으면(404) 영구적으로 스킵
+            if not detail:
+                logger.warning(f"Skipping {match_id}: match not found")
+                await match_queue.ack_match_id_async(match_id)
+                counts["dropped"] += 1
+                return
+
+            try:
+                # ARAM 필터링
+                game_mode = detail.get("info", {}).get("gameMode")
+                if game_mode != "ARAM":
+                    logger.info(f"Skipping {match_id}: not ARAM (mode: {game_mode})")
+                    await match_queue.ack_match_id_async(match_id)
+                    counts["skipped"] += 1
+                    return
+
+                # 매치 참가자 user_id 추출
+                participants = detail.get("metadata", {}).get("participants", [])
+
+                # ARAM 매치 참가자만 frontier에 추가 (최근 6시간 내 조회한 user는 제외)
+                participant_ids = [participant_id for participant_id in participants if participant_id]
+                with tracing.span("enqueue_participants"):
+                    counts["participants"] += sum(await user_frontier.add_user_ids_async(participant_ids))
+
+                # MongoDB에 저장 (MONGO_TIMELINE_STORAGE에 따라 timeline은 match_detail 컬렉션에 따로 또는 "timeline" 키 아래에 저장)
+                # bulk writer 스레드가 모아서 저장하므로 이벤트 루프는 막지 않음
+                with tracing.span("save_match"):
+                    saved = await mongodb.save_match_async(detail, timeline)
+                if not saved:
+                    # 쓰기 에러면 다음 실행에서 다시 처리
+                    await requeue(match_id)
+                    return
+
+                counts["saved"] += 1
+                logger.info(f"Saved match document for {match_id}")
+
+                await match_queue.ack_match_id_async(match_id)
+
+            except Exception as e:
+                logger.error(f"Error processing {match_id}: {str(e)}", exc_info=True)
+                await requeue(match_id)
+
+        # Redis에서 한 번에 가져온 match_id 버퍼 (worker들이 하나씩 꺼내 씀)
+        pending_match_ids = deque()
+
+        # API 키 인증 실패 (설정되면 모든 worker가 새 match를 가져오지 않고 종료)
+        auth_error = None
+
+        # worker가 lease로 가져와 처리 중인 match_id (실행이 중간에 실패하면 큐로 되돌림)
+        in_flight_match_ids = set()
+
+        # match_id 버퍼를 채우는 worker는 한 번에 하나 (조회를 기다리는 동안 다른 worker가 중복으로 lease하지 않도록)
+        refill_lock = asyncio.Lock()
+
+        async def skip_existing(match_ids):
+            """insert 모드면 이미 저장된 match는 detail/timeline을 요청하지 않고 바로 완료 처리"""
+            if not mongodb.insert_only:
+                return match_ids
+
+            try:
+                # pymongo 조회는 blocking이므로 이벤트 루프 밖에서 실행
+                with tracing.span("existence_check"):
+                    existing = await asyncio.get_running_loop().run_in_executor(None, mongodb.existing_match_ids, match_ids)
+            except Exception as e:
+                logger.warning(f"Failed to check existing matches: {e}")
+                return match_ids
+
+            if existing:
+                await match_queue.ack_match_ids_async(list(existing))
+                counts["existing"] += len(existing)
+            return [match_id for match_id in match_ids if match_id not in existing]
+
+        async def next_match_id():
+            async with refill_lock:
+                while not pending_match_ids:
+                    # 예산을 잡아둔 worker 몫 1개 + 남은 예산으로 처리할 수 있는 만큼만 가져온다
+                    count = min(MATCH_POP_BATCH_SIZE, 1 + budget // REQUESTS_PER_MATCH)
+                    with tracing.span("queue_lease"):
+                        match_ids = await match_queue.lease_match_ids_async(count)
+                    if not match_ids:
+                        return None
+                    pending_match_ids.extend(await skip_existing(match_ids))
+                return pending_match_ids.popleft()
+
+        async def worker(client):
+            """예산이 남아 있는 동안 match를 하나씩 가져와 조회 후 바로 저장"""
+            nonlocal budget
+
+            while budget >= REQUESTS_PER_MATCH and auth_error is None:
+                # 최대 요청 수만큼 예산을 먼저 잡아두고, 쓰지 않은 만큼은 돌려준다
+                budget -= REQUESTS_PER_MATCH
+
+                match_id = await next_match_id()
+                if not match_id:
+                    budget += REQUESTS_PER_MATCH
+                    return
+
+                # 실패나 취소로 끝나지 못한 match_id는 in_flight_match_ids에 남아 마지막에 되돌려진다
+                in_flight_match_ids.add(match_id)
+                await process_match(match_id, client)
+                in_flight_match_ids.discard(match_id)
+
+        async def process_match(match_id, client):
+            """match 하나 조회 후 저장 (남은 예산 정산 포함)"""
+            nonlocal budget, auth_error
+
+            counts["processed"] += 1
+            try:
+                detail, timeline, used_requests = await fetch_match(match_id, client)
+            except RiotAuthError as e:
+                # match 문제가 아니므로 시도 횟수를 늘리지 않고 lease만 되돌린 뒤 실행 중단
+                counts["processed"] -= 1
+                counts["requests"] += 1
+                await match_queue.release_match_ids_async([match_id])
+                auth_error = auth_error or e
+                return
+            except Exception as e:
+                # 에러 처리 (일시적인 에러면 재시도 큐로, 아니면 버림)
+                logger.error(f"Error fetching {match_id}: {e}")
+                counts["requests"] += REQUESTS_PER_MATCH
+
+                if not isinstance(e, RiotApiError) or e.retryable:
+                    await requeue(match_id)
+                else:
+                    await match_queue.ack_match_id_async(match_id)
+                    counts["dropped"] += 1
+                return
+
+            budget += REQUESTS_PER_MATCH - used_requests
+            counts["requests"] += used_requests
+
+            await handle_match(match_id, detail, timeline)
+
+        logger.info(f"Processing match_ids with {MAX_IN_FLIGHT_MATCHES} workers (budget: {budget} requests)")
+
+        # 동시에 처리 중인 match 수를 MAX_IN_FLIGHT_MATCHES로 제한 (요청 속도는 limiter가 조절)
+        # worker 하나가 실패하면 TaskGroup이 나머지 worker를 취소한다
+        client = get_async_client()
+        try:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(MAX_IN_FLIGHT_MATCHES):
+                    group.create_task(worker(client))
+        finally:
+            # 예산이 모자라 처리하지 못했거나, 실패로 중단된 match_id는 큐 앞쪽으로 되돌림 (시도 횟수 유지)
+            unfinished = list(pending_match_ids) + list(in_flight_match_ids)
+            if unfinished:
+                match_queue.release_match_ids(unfinished)
+
+        if auth_error:
+            raise auth_error
+        return counts
 
     # 비동기 함수 실행
     try:
-        saved, participants, requests = asyncio.run(
-            process_matches_batch(match_ids)
+        counts = run(
+            process_matches_pipeline(request_budget)
         )
 
-        logger.info(f"Completed: {saved} saved, {participants} participants added, {requests} API requests")
+        for name in ("processed", "saved", "skipped", "existing", "dropped", "requeued", "dead_lettered"):
+            metrics.inc(f"aram_matches_{name}_total", counts[name])
+
+        if not counts["processed"] and not counts["existing"]:
+            logger.info("MatchIdQueue is empty")
+            return {"status": "no_matches"}
+
+        logger.info(
+            f"Completed: {counts['processed']} processed, {counts['saved']} saved, {counts['skipped']} skipped, "
+            f"{counts['existing']} already stored, "
+            f"{counts['participants']} participants added, {counts['requests']} API requests, "
+            f"{counts['requeued']} requeued, {counts['dead_lettered']} dead-lettered, {counts['dropped']} dropped"
+        )
 
         return {
             "status": "success",
-            "matches_processed": len(match_ids),
-            "matches_saved": saved,
-            "participants_added": participants,
-            "api_requests": requests
+            "matches_processed": counts["processed"],
+            "matches_saved": counts["saved"],
+            "matches_skipped": counts["skipped"],
+            "matches_existing": counts["existing"],
+            "participants_added": counts["participants"],
+            "api_requests": counts["requests"],
+            "matches_requeued": counts["requeued"],
+            "matches_dead_lettered": counts["dead_lettered"],
+            "matches_dropped": counts["dropped"]
         }
 
+    except RiotAuthError as e:
+        logger.error(f"Riot API key rejected ({e.status_code}), stopping get_match_info: check RIOT_API_KEY")
+        return {"status": "error", "message": "Riot API key rejected", "status_code": e.status_code}
+
     except Exception as e:
         logger.error(f"Error in get_match_info: {str(e)}", exc_info=True)
         return {"status": "error", "message": str(e)}
 
+    finally:
+        metrics.flush()
+
 
 @celery_app.task(name="tasks.get_match_id_list")
+@scheduling.singleton("tasks.get_match_id_list", next_run_delay)
+@tracing.traced("tasks.get_match_id_list")
 def get_match_id_list():
     """
-    UserIdQueue에서 user_id를 가져와 match_id 목록 조회 후 MatchIdQueue에 추가
+    UserFrontier에서 ARAM yield가 높은 user_id 여러 개를 가져와 ARAM match_id 목록을 동시에 조회 후 MatchIdQueue에 추가
+    - MatchIdQueue가 목표 길이(MATCH_QUEUE_TARGET_DEPTH)를 유지하도록 조회할 user 수를 정한다. (rate limit 예산 안에서, get_match_info 몫은 남겨둔다)
+    - user별로 새로 찾은 ARAM match 개수를 기록해 다음 우선순위에 반영한다.
     """
-    from match.queue import MatchIdQueue
-
-    user_queue = UserIdQueue()
-    match_queue = MatchIdQueue()
+    user_frontier = get_user_frontier()
+    match_queue = get_match_queue()
+    watermark = get_crawl_watermark()
     riot_api_key = os.getenv("RIOT_API_KEY")
 
     if not riot_api_key:
         logger.error("RIOT_API_KEY not found in environment variables")
         return {"status": "error", "message": "No API key"}
 
-    # UserIdQueue에서 user_id 가져오기
-    user_id = user_queue.get_user_id()
-
-    if not user_id:
-        # 큐가 비어있으면 기본 user_id 추가
-        logger.info("UserIdQueue is empty, adding default user_ids...")
-        for default_id in DEFAULT_INITIAL_USER_IDS:
-            if user_queue.add_user_id(default_id):
-                logger.info(f"Added default user_id: {default_id}")
+    # 목표 길이까지 부족한 match_id 개수로 이번에 조회할 user 수 결정
+    match_queue_size = match_queue.queue_size()
+    deficit = MATCH_QUEUE_TARGET_DEPTH - match_queue_size
+
+    if deficit <= 0:
+        logger.info(f"MatchIdQueue has enough match_ids ({match_queue_size}), skipping this run")
+        return {"status": "queue_full", "match_queue_size": match_queue_size}
+
+    average_yield = max(watermark.average_yield(), 1.0)
+    users_to_fetch = min(max(math.ceil(deficit / average_yield), MIN_USERS_PER_TICK), MAX_USERS_PER_TICK)
+
+    # 다음 실행 전까지 사용할 수 있는 app rate limit 중 get_match_info 몫을 뺀 만큼만 사용한다
+    limiter = get_rate_limiter()
+    request_budget = int(limiter.available_permits(RUN_INTERVAL_SECONDS) * (1 - MATCH_INFO_BUDGET_RESERVE))
+    # 이전에 조회한 user는 새 match만 조회하므로 평균 yield로 페이지 수를 추정하고,
+    # 처음 조회하는 user는 MAX_MATCH_ID_PAGES 페이지를 모두 쓴다고 본다 (아래에서 user별로 다시 계산)
+    pages_per_user = min(max(math.ceil(average_yield / MAX_MATCH_IDS_PER_PAGE), 1), MAX_MATCH_ID_PAGES)
+    users_to_fetch = min(users_to_fetch, request_budget // pages_per_user)
+
+    if users_to_fetch < MIN_USERS_PER_TICK:
+        logger.info("Rate limit budget exhausted, skipping this run")
+        return {"status": "rate_limited"}
+
+    # UserFrontier에서 우선순위가 높은 user_id 가져오기
+    user_ids = user_frontier.pop_user_ids(users_to_fetch)
+
+    if not user_ids:
+        # 이전 FIFO 큐에 남아있던 user_id를 frontier로 옮기고, 그래도 비어있으면 기본 user_id 추가
+        legacy_user_ids = UserIdQueue().pop_user_ids(MAX_FRONTIER_MIGRATION_BATCH)
+        if legacy_user_ids:
+            logger.info(f"Moving {len(legacy_user_ids)} user_ids from UserIdQueue to UserFrontier")
+            user_frontier.add_user_ids(legacy_user_ids, ignore_cooldown=True)
+        else:
+            logger.info("UserFrontier is empty, adding default user_ids...")
+            for default_id, added in zip(DEFAULT_INITIAL_USER_IDS, user_frontier.add_user_ids(DEFAULT_INITIAL_USER_IDS, ignore_cooldown=True)):
+                if added:
+                    logger.info(f"Added default user_id: {default_id}")
 
         # 다시 가져오기
-        user_id = user_queue.get_user_id()
-        if not user_id:
+        user_ids = user_frontier.pop_user_ids(users_to_fetch)
+
+        if not user_ids:
             logger.warning("No user_ids available after adding defaults")
             return {"status": "no_users"}
 
+    # 이전에 조회한 user면 그 이후의 match만 가져온다 (이벤트 루프 밖에서 한 번에 조회)
+    start_times = watermark.get_start_times(user_ids)
+    crawled_at = int(time.time())
+
+    # user별 최대 요청 수로 예산 안에 들어가는 user만 조회하고 나머지는 frontier에 되돌림
+    selected_user_ids, deferred_user_ids, planned_requests = [], [], 0
+    for user_id in user_ids:
+        pages = MAX_MATCH_ID_PAGES if start_times[user_id] is None else pages_per_user
+        if planned_requests + pages > request_budget:
+            deferred_user_ids.append(user_id)
+            continue
+        selected_user_ids.append(user_id)
+        planned_requests += pages
+    user_frontier.add_user_ids(deferred_user_ids, ignore_cooldown=True)
+    user_ids = selected_user_ids
+
+    if not user_ids:
+        logger.info("Rate limit budget too small for the next user, skipping this run")
+        return {"status": "rate_limited"}
+
+    logger.info(
+        f"Fetching match_ids for {len(user_ids)} user_ids "
+        f"(match queue: {match_queue_size}, target: {MATCH_QUEUE_TARGET_DEPTH}, "
+        f"budget: {request_budget} requests, planned: {planned_requests})"
+    )
+
+    async def fetch_user_match_ids(user_id, client):
+        # 서버에서 ARAM(queue=450)만 필터링해서 가져온다
+        return await get_match_ids_async(
+            user_id,
+            riot_api_key,
+            client,
+            limiter=limiter,
+            queue=ARAM_QUEUE_ID,
+            start_time=start_times[user_id],
+            max_pages=MAX_MATCH_ID_PAGES
+        )
+
+    async def fetch_all():
+        client = get_async_client()
+        return await asyncio.gather(
+            *[fetch_user_match_ids(user_id, client) for user_id in user_ids],
+            return_exceptions=True
+        )
+
     try:
-        logger.info(f"Fetching match_ids for user_id: {user_id}")
-        match_ids = get_match_ids(user_id, riot_api_key, start=0, count=100)
+        results = run(fetch_all())
+    except Exception as e:
+        logger.error(f"Error in get_match_id_list: {str(e)}", exc_info=True)
+        metrics.flush()
+        user_frontier.add_user_ids(user_ids, ignore_cooldown=True)
+        return {"status": "error", "message": str(e)}
 
-        if not match_ids:
-            logger.info(f"No match_ids found for user_id: {user_id}")
-            return {
-                "status": "success",
-                "user_id": user_id,
-                "match_ids_found": 0,
-                "match_ids_added": 0
-            }
+    found_count = 0
+    added_count = 0
+    error_count = 0
+    retry_user_ids = []
+    user_yields = {}
+    auth_error = None
 
-        logger.info(f"Found {len(match_ids)} match_ids for user_id: {user_id}")
+    for user_id, match_ids in zip(user_ids, results):
+        if isinstance(match_ids, RiotAuthError):
+            # user 문제가 아니므로 에러로 세지 않고 frontier에 그대로 되돌림
+            auth_error = match_ids
+            retry_user_ids.append(user_id)
+            continue
+
+        if isinstance(match_ids, Exception):
+            logger.error(f"Error fetching match_ids for user_id {user_id}: {match_ids}")
+            error_count += 1
+
+            # 일시적인 에러면 다음 실행에서 다시 조회하도록 user_id를 frontier에 되돌림
+            if not isinstance(match_ids, RiotApiError) or match_ids.retryable:
+                retry_user_ids.append(user_id)
+            continue
+
+        found_count += len(match_ids)
 
         # MatchIdQueue에 추가 (자동 중복 제거)
-        added_count = 0
-        for match_id in match_ids:
-            if match_queue.add_match_id(match_id):
-                added_count += 1
+        with tracing.span("enqueue_match_ids"):
+            user_yields[user_id] = sum(match_queue.add_match_ids(match_ids))
+        added_count += user_yields[user_id]
 
-        logger.info(f"Added {added_count}/{len(match_ids)} new match_ids to queue")
+    user_frontier.add_user_ids(retry_user_ids, ignore_cooldown=True)
+    user_frontier.record_yields(user_yields)
 
-        return {
-            "status": "success",
-            "user_id": user_id,
-            "match_ids_found": len(match_ids),
-            "match_ids_added": added_count
-        }
+    # 조회에 성공한 user만 조회 시각 갱신
+    watermark.update_many({user_id: crawled_at for user_id in user_yields})
 
-    except Exception as e:
-        logger.error(f"Error fetching match_ids for user_id {user_id}: {str(e)}", exc_info=True)
-        return {
-            "status": "error",
-            "message": str(e),
-            "user_id": user_id
-        }
\ No newline at end of file
+    crawled_count = len(user_yields)
+    watermark.record_yield(crawled_count, added_count)
+
+    metrics.inc("aram_users_crawled_total", crawled_count)
+    metrics.inc("aram_match_ids_added_total", added_count)
+    metrics.flush()
+
+    if auth_error:
+        logger.error(f"Riot API key rejected ({auth_error.status_code}), stopping get_match_id_list: check RIOT_API_KEY")
+        return {"status": "error", "message": "Riot API key rejected", "status_code": auth_error.status_code}
+
+    logger.info(f"Added {added_count}/{found_count} new match_ids from {len(user_ids)} user_ids ({error_count} errors)")
+
+    return {
+        "status": "success",
+        "users_processed": len(user_ids),
+        "user_errors": error_count,
+        "match_ids_found": found_count,
+        "match_ids_added": added_count
+    }
@@ -0,0 +1,172 @@
+import os
+import time
+import random
+import cProfile
+import functools
+import importlib.util
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 단계별 소요 시간 기록 여부
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+
+# 프로파일링할 task 이름 (예: tasks.get_match_detail, 없으면 프로파일링하지 않음)
+PROFILE_TASK = os.getenv("PROFILE_TASK")
+
+# PROFILE_TASK 실행 중 프로파일링할 비율 (0~1)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.1))
+
+# 프로파일 결과 저장 경로
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/profiles")
+
+# 샘플링 프로파일러 사용 여부 (pyinstrument가 설치된 경우에만 사용, 없으면 cProfile)
+PYINSTRUMENT_AVAILABLE = importlib.util.find_spec("pyinstrument") is not None
+
+
+class Tracer:
+    """task 실행 1회 동안 단계(span)별 소요 시간 기록"""
+
+    def __init__(self):
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        블록 실행 시간을 name 단계로 기록 (비동기 함수 안에서는 await 대기 시간도 포함)
+
+        Args:
+            name: 단계 이름
+        """
+        if not TRACING_ENABLED:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float):
+        """
+        단계 소요 시간 기록 (metrics histogram에도 누적)
+
+        Args:
+            name: 단계 이름
+            seconds: 소요 시간 (초)
+        """
+        self._durations[name].append(seconds)
+        metrics.observe("aram_stage_duration_seconds", seconds, stage=name)
+
+    def reset(self):
+        """기록 초기화 (task 실행 시작 시 호출)"""
+        self._durations.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        단계별 소요 시간 요약
+
+        동시에 실행된 span은 겹쳐서 기록되므로 total_s 합계는 task 실행 시간보다 클 수 있다.
+
+        Returns:
+            Dict[str, Dict[str, float]]: {단계 이름: {count, total_s, mean_ms, p95_ms, max_ms}}
+        """
+        result = {}
+        for name, durations in sorted(self._durations.items()):
+            ordered = sorted(durations)
+            p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+            result[name] = {
+                "count": len(ordered),
+                "total_s": round(sum(ordered), 3),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                "p95_ms": round(p95 * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return result
+
+
+# 전역 인스턴스 (worker 프로세스는 task를 하나씩 실행하므로 실행마다 reset해서 사용)
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Tracer 싱글톤 인스턴스 반환"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def span(name: str):
+    """전역 Tracer의 span (with tracing.span("save_match"): ...)"""
+    return get_tracer().span(name)
+
+
+@contextmanager
+def profile(task_name: str) -> Iterator[None]:
+    """
+    PROFILE_TASK로 지정한 task 실행을 PROFILE_SAMPLE_RATE 비율로 프로파일링
+
+    pyinstrument가 있으면 샘플링 프로파일 HTML, 없으면 cProfile 통계(.prof)를 PROFILE_DIR에 저장한다.
+
+    Args:
+        task_name: 실행 중인 task 이름
+    """
+    if task_name != PROFILE_TASK or random.random() >= PROFILE_SAMPLE_RATE:
+        yield
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{task_name}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+    if PYINSTRUMENT_AVAILABLE:
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            path += ".html"
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+            logger.info(f"Saved profile of {task_name} to {path}")
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            path += ".prof"
+            profiler.dump_stats(path)
+            logger.info(f"Saved profile of {task_name} to {path}")
+
+
+def traced(task_name: str) -> Callable:
+    """
+    task 실행마다 단계 기록을 초기화하고, dict 결과에 단계별 요약("stages")을 추가하는 decorator
+
+    Args:
+        task_name: task 이름 (PROFILE_TASK와 비교)
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            tracer.reset()
+
+            with profile(task_name):
+                result = func(*args, **kwargs)
+
+            if TRACING_ENABLED and isinstance(result, dict):
+                result["stages"] = tracer.summary()
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,166 @@
+import os
+import time
+from typing import Dict, List
+from db.redis import get_async_redis_client, get_redis_client
+
+# 최근에 match_id 목록을 조회한 user는 이 시간 동안 frontier에 다시 넣지 않음 (초)
+RECRAWL_COOLDOWN_SECONDS = 6 * 60 * 60
+
+# 이 시간(초)만큼 최근에 본 user는 ARAM match 1개를 더 찾은 것과 같은 우선순위를 가짐
+RECENCY_SCALE_SECONDS = 24 * 60 * 60
+
+# 조회한 적 없는 user의 ARAM match 개수 기본 추정치
+DEFAULT_USER_ARAM_YIELD = 1.0
+
+# user별 새 ARAM match 개수 이동 평균 가중치
+USER_YIELD_EMA_ALPHA = 0.3
+
+# frontier 최대 크기 (넘치면 우선순위가 낮은 user부터 제거, 0이면 제한 없음)
+MAX_FRONTIER_SIZE = int(os.getenv("MAX_FRONTIER_SIZE", "1000000"))
+
+# user 추가 (최근 조회한 user 제외, 점수 = ARAM yield 이동 평균 + 최근성)
+# KEYS: [frontier ZSET 키, yield HASH 키, watermark HASH 키]
+# ARGV: [현재 시각, 재조회 대기 시간, 최근성 스케일, 기본 yield, 최대 크기, user_id...]
+PUSH_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cooldown = tonumber(ARGV[2])
+local recency_scale = tonumber(ARGV[3])
+local default_yield = tonumber(ARGV[4])
+local max_size = tonumber(ARGV[5])
+local added = {}
+for i = 6, #ARGV do
+    local user_id = ARGV[i]
+    added[i - 5] = 0
+    local crawled_at = redis.call('HGET', KEYS[3], user_id)
+    if not crawled_at or now - tonumber(crawled_at) >= cooldown then
+        local user_yield = redis.call('HGET', KEYS[2], user_id)
+        user_yield = user_yield and tonumber(user_yield) or default_yield
+        added[i - 5] = redis.call('ZADD', KEYS[1], user_yield + now / recency_scale, user_id)
+    end
+end
+if max_size > 0 then
+    local overflow = redis.call('ZCARD', KEYS[1]) - max_size
+    if overflow > 0 then
+        redis.call('ZREMRANGEBYRANK', KEYS[1], 0, overflow - 1)
+    end
+end
+return added
+"""
+
+
+class UserFrontier:
+    """ARAM yield와 최근성으로 우선순위를 매긴 user_id(puuid) 조회 대기열 (Redis ZSET)"""
+
+    def __init__(self, zset_key: str = "user_frontier", watermark_key: str = "user_crawl_watermark"):
+        """
+        Args:
+            zset_key: Redis ZSET 키 이름
+            watermark_key: user별 마지막 조회 시각 HASH 키 (CrawlWatermark와 공유)
+        """
+        self.redis_client = get_redis_client()
+        self.zset_key = zset_key
+        self.yield_key = f"{zset_key}:yield"
+        self.watermark_key = watermark_key
+
+        self._push_script = self.redis_client.register_script(PUSH_SCRIPT)
+        self._async_push_script = get_async_redis_client().register_script(PUSH_SCRIPT)
+
+    def add_user_ids(self, user_ids: List[str], ignore_cooldown: bool = False) -> List[bool]:
+        """
+        여러 user_id를 frontier에 추가 (이미 있으면 최근성만 갱신)
+
+        Args:
+            user_ids: 추가할 user_id 리스트
+            ignore_cooldown: True면 최근에 조회한 user도 추가 (조회 실패 후 되돌릴 때 사용)
+
+        Returns:
+            List[bool]: user_id별 새로 추가 여부 (이미 있거나 최근에 조회했으면 False)
+        """
+        if not user_ids:
+            return []
+
+        added = self._push_script(keys=self._push_keys(), args=self._push_args(user_ids, ignore_cooldown))
+        return [bool(value) for value in added]
+
+    async def add_user_ids_async(self, user_ids: List[str], ignore_cooldown: bool = False) -> List[bool]:
+        """add_user_ids의 비동기 버전 (이벤트 루프를 막지 않음)"""
+        if not user_ids:
+            return []
+
+        added = await self._async_push_script(keys=self._push_keys(), args=self._push_args(user_ids, ignore_cooldown))
+        return [bool(value) for value in added]
+
+    def _push_keys(self) -> List[str]:
+        return [self.zset_key, self.yield_key, self.watermark_key]
+
+    @staticmethod
+    def _push_args(user_ids: List[str], ignore_cooldown: bool) -> list:
+        return [
+            int(time.time()),
+            0 if ignore_cooldown else RECRAWL_COOLDOWN_SECONDS,
+            RECENCY_SCALE_SECONDS,
+            DEFAULT_USER_ARAM_YIELD,
+            MAX_FRONTIER_SIZE,
+            *user_ids
+        ]
+
+    def pop_user_ids(self, count: int) -> List[str]:
+        """
+        우선순위가 높은 user_id부터 여러 개를 가져옴
+
+        Args:
+            count: 가져올 최대 개수
+
+        Returns:
+            List[str]: 가져온 user_id 리스트
+        """
+        if count <= 0:
+            return []
+        return [user_id for user_id, _ in self.redis_client.zpopmax(self.zset_key, count)]
+
+    def record_yields(self, yields: Dict[str, int]):
+        """
+        조회 결과로 user별 새 ARAM match 개수 이동 평균 갱신
+
+        Args:
+            yields: user_id별 새로 추가된 ARAM match_id 개수
+        """
+        if not yields:
+            return
+
+        user_ids = list(yields)
+        previous = self.redis_client.hmget(self.yield_key, user_ids)
+
+        averages = {}
+        for user_id, average in zip(user_ids, previous):
+            average = float(average) if average is not None else DEFAULT_USER_ARAM_YIELD
+            averages[user_id] = average + USER_YIELD_EMA_ALPHA * (yields[user_id] - average)
+
+        self.redis_client.hset(self.yield_key, mapping=averages)
+
+    def user_yield(self, user_id: str) -> float:
+        """
+        user의 새 ARAM match 개수 이동 평균
+
+        Args:
+            user_id: 조회할 user_id
+
+        Returns:
+            float: 이동 평균 (조회한 적 없으면 기본 추정치)
+        """
+        value = self.redis_client.hget(self.yield_key, user_id)
+        return float(value) if value is not None else DEFAULT_USER_ARAM_YIELD
+
+    def size(self) -> int:
+        """
+        frontier에 있는 user 수 반환
+
+        Returns:
+            int: ZSET 크기
+        """
+        return self.redis_client.zcard(self.zset_key)
+
+    def clear(self):
+        """frontier와 user별 yield 통계 초기화"""
+        self.redis_client.delete(self.zset_key)
+        self.redis_client.delete(self.yield_key)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from db.redis import BaseRedisQueue
 
 
@@ -24,6 +24,19 @@ class UserIdQueue(BaseRedisQueue):
         """
         return self.add(user_id, ttl)
 
+    def add_user_ids(self, user_ids: List[str], ttl: Optional[int] = None) -> List[bool]:
+        """
+        여러 user_id를 한 번에 큐에 추가 (중복 제거)
+
+        Args:
+            user_ids: 추가할 user_id 리스트
+            ttl: TTL in seconds (None이면 영구 중복 제거)
+
+        Returns:
+            List[bool]: user_id별 추가 성공 여부 (이미 존재하면 False)
+        """
+        return self.add_many(user_ids, ttl)
+
     def get_user_id(self) -> Optional[str]:
         """
         큐에서 user_id를 가져옴 (FIFO)
@@ -33,3 +46,14 @@ class UserIdQueue(BaseRedisQueue):
         """
         return self.get()
 
+    def pop_user_ids(self, count: int) -> List[str]:
+        """
+        큐에서 여러 user_id를 한 번에 가져옴 (FIFO)
+
+        Args:
+            count: 가져올 최대 개수
+
+        Returns:
+            List[str]: 가져온 user_id 리스트
+        """
+        return self.pop_many(count)
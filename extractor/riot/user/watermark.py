@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional
+from db.redis import get_redis_client
+
+# 조회 시점에 진행 중이던 게임이 누락되지 않도록 watermark에서 빼는 시간 (초)
+WATERMARK_OVERLAP_SECONDS = 30 * 60
+
+# user 1명당 새 match_id 개수 기본 추정치 (통계가 쌓이기 전까지 사용)
+DEFAULT_MATCH_ID_YIELD = 5.0
+
+# 새 match_id 개수 이동 평균 가중치
+YIELD_EMA_ALPHA = 0.2
+
+
+class CrawlWatermark:
+    """user_id(puuid)별 마지막 match_id 목록 조회 시각 (Redis HASH)"""
+
+    def __init__(self, hash_key: str = "user_crawl_watermark"):
+        """
+        Args:
+            hash_key: Redis HASH 키 이름
+        """
+        self.redis_client = get_redis_client()
+        self.hash_key = hash_key
+        self.yield_key = f"{hash_key}:yield"
+
+    def get_start_time(self, user_id: str) -> Optional[int]:
+        """
+        다음 조회에 사용할 startTime 반환
+
+        Args:
+            user_id: 조회할 user_id
+
+        Returns:
+            Optional[int]: epoch 초 (겹침 시간 반영), 조회한 적 없으면 None
+        """
+        crawled_at = self.redis_client.hget(self.hash_key, user_id)
+        if crawled_at is None:
+            return None
+        return max(int(crawled_at) - WATERMARK_OVERLAP_SECONDS, 0)
+
+    def get_start_times(self, user_ids: List[str]) -> Dict[str, Optional[int]]:
+        """
+        여러 user의 startTime을 한 번에 조회 (HMGET 1회)
+
+        Args:
+            user_ids: 조회할 user_id 리스트
+
+        Returns:
+            Dict[str, Optional[int]]: user_id별 epoch 초 (겹침 시간 반영), 조회한 적 없으면 None
+        """
+        if not user_ids:
+            return {}
+        values = self.redis_client.hmget(self.hash_key, user_ids)
+        return {
+            user_id: None if crawled_at is None else max(int(crawled_at) - WATERMARK_OVERLAP_SECONDS, 0)
+            for user_id, crawled_at in zip(user_ids, values)
+        }
+
+    def update(self, user_id: str, crawled_at: int):
+        """
+        조회 시각 갱신
+
+        Args:
+            user_id: 조회한 user_id
+            crawled_at: 조회를 시작한 시각 (epoch 초)
+        """
+        self.redis_client.hset(self.hash_key, user_id, crawled_at)
+
+    def update_many(self, crawled_at: Dict[str, int]):
+        """
+        여러 user의 조회 시각을 한 번에 갱신 (HSET 1회)
+
+        Args:
+            crawled_at: user_id별 조회를 시작한 시각 (epoch 초)
+        """
+        if crawled_at:
+            self.redis_client.hset(self.hash_key, mapping=crawled_at)
+
+    def average_yield(self) -> float:
+        """
+        user 1명을 조회했을 때 새로 추가되는 match_id 개수의 이동 평균
+
+        Returns:
+            float: 평균 새 match_id 개수
+        """
+        value = self.redis_client.get(self.yield_key)
+        return float(value) if value is not None else DEFAULT_MATCH_ID_YIELD
+
+    def record_yield(self, users: int, added: int):
+        """
+        조회 결과로 이동 평균 갱신
+
+        Args:
+            users: 조회한 user 수
+            added: 새로 추가된 match_id 개수
+        """
+        if users <= 0:
+            return
+        average = self.average_yield()
+        average += YIELD_EMA_ALPHA * (added / users - average)
+        self.redis_client.set(self.yield_key, average)
+
+    def size(self) -> int:
+        """
+        watermark가 기록된 user 수 반환
+
+        Returns:
+            int: HASH 필드 개수
+        """
+        return self.redis_client.hlen(self.hash_key)
+
+    def clear(self):
+        """watermark 전체 초기화"""
+        self.redis_client.delete(self.hash_key)
+        self.redis_client.delete(self.yield_key)